@@ -8,6 +8,14 @@ export POOL_LOG_DIR=${POOL_LOG_DIR:=/data/pool_log}
 cd /root/api
 ../venv/bin/python manage.py collectstatic --no-input
 ../venv/bin/python manage.py migrate
+../venv/bin/python manage.py createcachetable
+
+echo "PATH=/bin:/sbin:/usr/sbin:/usr/bin" > /etc/cron.d/api
+echo "POOL_CONFIG_PATH=${POOL_CONFIG_PATH}" >> /etc/cron.d/api
+echo "DJANGO_SETTINGS_FILE=${DJANGO_SETTINGS_FILE}" >> /etc/cron.d/api
+echo "30 * * * * root cd /root/api && ../venv/bin/python manage.py partial_partitions >> /var/log/cron.log 2>&1" >> /etc/cron.d/api
+echo "45 0 * * * root cd /root/api && ../venv/bin/python manage.py partial_archive >> /var/log/cron.log 2>&1" >> /etc/cron.d/api
+echo "15 3 * * * root cd /root/api && ../venv/bin/python manage.py partial_retention >> /var/log/cron.log 2>&1" >> /etc/cron.d/api
 
 if [ -n "${GIVEAWAY_ENABLED}" ]; then
 	echo "PATH=/bin:/sbin:/usr/sbin:/usr/bin" > /etc/cron.d/giveaway
@@ -17,12 +25,14 @@ if [ -n "${GIVEAWAY_ENABLED}" ]; then
 		echo "0 0 * * * root cd /root/api && ../venv/bin/python manage.py giveaway_new >> /var/log/cron.log 2>&1" >> /etc/cron.d/giveaway
 	fi
 	echo "1 0 * * * root cd /root/api && ../venv/bin/python manage.py giveaway_round >> /var/log/cron.log 2>&1" >> /etc/cron.d/giveaway
-
-	cron
 fi
 
+cron
+
 sed -i s,%%DOMAIN%%,${DOMAIN:=localhost},g /etc/Caddyfile
 
 caddy start -config /etc/Caddyfile
 
+../venv/bin/python manage.py refresh_stats --loop &
+
 exec ../venv/bin/gunicorn -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:8000 openchiaapi.asgi:application
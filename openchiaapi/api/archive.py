@@ -0,0 +1,243 @@
+import datetime
+import itertools
+import json
+import os
+import shutil
+
+import numpy as np
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max
+from django.db.models.functions import Collate
+
+from .models import Partial
+from .partitions import DAY, get_partitions
+
+
+# Each archived day is a directory of .npy columns holding the partials
+# sorted by launcher and timestamp. Launcher ids are kept once in
+# launchers.npy with offsets.npy pointing to the rows of each of them, and
+# string columns are dictionary encoded (codes plus a .dict.npy of values,
+# -1 for NULL). That is 44 bytes per partial, and the files are kept as
+# plain .npy rather than np.savez_compressed: compressed members cannot be
+# memory mapped, so reading the rows of a single launcher would inflate
+# every column of the day first. Compress at the filesystem level if needed.
+#
+# meta.json records the id up to which the partials of the day are
+# archived, the ones committed later are picked up by archive_late_days().
+ARCHIVE_COLUMNS = (
+    ('id', np.int64),
+    ('timestamp', np.int64),
+    ('difficulty', np.int32),
+)
+ARCHIVE_DICT_COLUMNS = ('error', 'harvester_id', 'plot_id', 'chia_version', 'pool_host')
+ARCHIVE_CHUNK_SIZE = 10000
+
+
+def day_path(day_start):
+    day = datetime.datetime.fromtimestamp(day_start, datetime.timezone.utc)
+    return os.path.join(settings.PARTIAL_ARCHIVE_DIR, f'{day:%Y}', f'{day:%Y%m%d}')
+
+
+def get_archived_days():
+    """
+    Start timestamps of the archived days, sorted.
+    """
+    root = settings.PARTIAL_ARCHIVE_DIR
+    days = []
+    if not root or not os.path.isdir(root):
+        return days
+    for year in os.listdir(root):
+        if not year.isdigit():
+            continue
+        for name in os.listdir(os.path.join(root, year)):
+            if name.isdigit() and os.path.exists(os.path.join(root, year, name, 'meta.json')):
+                day = datetime.datetime.strptime(name, '%Y%m%d').replace(tzinfo=datetime.timezone.utc)
+                days.append(int(day.timestamp()))
+    return sorted(days)
+
+
+def archived_until():
+    """
+    End of the archived days, which are written in order, or None if
+    nothing was archived yet.
+    """
+    days = get_archived_days()
+    return days[-1] + DAY if days else None
+
+
+def dictionary_values(dictionary):
+    return np.array([i.encode() for i in dictionary], dtype=bytes)
+
+
+def load_day(path):
+    """
+    Columns, dictionary codes and dictionaries of an archived day, launcher
+    ids included.
+    """
+    launchers = np.load(os.path.join(path, 'launchers.npy'))
+    offsets = np.load(os.path.join(path, 'offsets.npy'))
+    columns = {name: np.load(os.path.join(path, f'{name}.npy')) for name, _ in ARCHIVE_COLUMNS}
+    codes = {'launcher_id': np.repeat(np.arange(len(launchers), dtype=np.int32), np.diff(offsets))}
+    dictionaries = {'launcher_id': [i.decode() for i in launchers]}
+    for name in ARCHIVE_DICT_COLUMNS:
+        codes[name] = np.load(os.path.join(path, f'{name}.npy'))
+        dictionaries[name] = [i.decode() for i in np.load(os.path.join(path, f'{name}.dict.npy'))]
+    return columns, codes, dictionaries
+
+
+def archive_day(day_start):
+    """
+    Write the partials of the day starting at `day_start` to the archive. If
+    the day is already archived, the partials committed since are added to
+    it, the ones removed from the database since are kept. Returns the
+    number of partials.
+    """
+    path = day_path(day_start)
+    fields = ['launcher_id'] + [name for name, _ in ARCHIVE_COLUMNS] + list(ARCHIVE_DICT_COLUMNS)
+    partials = Partial.objects.filter(timestamp__gte=day_start, timestamp__lt=day_start + DAY)
+    previous = None
+    if os.path.exists(os.path.join(path, 'meta.json')):
+        previous = load_day(path)
+        partials = partials.filter(id__gt=get_archived_max_id(day_start))
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        # The count and the rows are read from the same snapshot
+        cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        total = partials.count()
+        # Partials of the day up to this id are all in the snapshot
+        max_id = Partial.objects.aggregate(max_id=Max('id'))['max_id'] or 0
+        columns = {name: np.empty(total, dtype=dtype) for name, dtype in ARCHIVE_COLUMNS}
+        codes = {name: np.empty(total, dtype=np.int32) for name in ('launcher_id',) + ARCHIVE_DICT_COLUMNS}
+        # New values are coded after the ones already archived
+        dictionaries = {name: {} for name in codes}
+        if previous:
+            for name, values in previous[2].items():
+                dictionaries[name] = {value: code for code, value in enumerate(values)}
+
+        # Byte order of the launcher ids, as looked up with searchsorted
+        rows = partials.order_by(Collate('launcher_id', 'C'), 'timestamp', 'id').values_list(
+            *fields,
+        ).iterator(chunk_size=ARCHIVE_CHUNK_SIZE)
+        end = 0
+        for chunk in iter(lambda: list(itertools.islice(rows, ARCHIVE_CHUNK_SIZE)), []):
+            start, end = end, end + len(chunk)
+            chunk = dict(zip(fields, zip(*chunk)))
+            for name, _ in ARCHIVE_COLUMNS:
+                columns[name][start:end] = chunk[name]
+            for name, dictionary in dictionaries.items():
+                codes[name][start:end] = [
+                    -1 if i is None else dictionary.setdefault(i, len(dictionary)) for i in chunk[name]
+                ]
+
+    launchers = dictionary_values(dictionaries.pop('launcher_id'))
+    if previous:
+        # Archives written before max_id was recorded hold the same ids
+        new = ~np.isin(columns['id'], previous[0]['id'])
+        columns = {name: np.concatenate([previous[0][name], columns[name][new]]) for name in columns}
+        codes = {name: np.concatenate([previous[1][name], codes[name][new]]) for name in codes}
+        total = len(columns['id'])
+        # Launchers sorted again, and the rows by launcher, timestamp and id
+        order = np.argsort(launchers)
+        launchers = launchers[order]
+        rank = np.empty(len(order), dtype=np.int32)
+        rank[order] = np.arange(len(order))
+        codes['launcher_id'] = rank[codes['launcher_id']]
+        rows = np.lexsort((columns['id'], columns['timestamp'], codes['launcher_id']))
+        columns = {name: values[rows] for name, values in columns.items()}
+        codes = {name: values[rows] for name, values in codes.items()}
+    offsets = np.searchsorted(codes.pop('launcher_id'), np.arange(len(launchers) + 1))
+
+    tmp = f'{path}.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+    np.save(os.path.join(tmp, 'launchers.npy'), launchers)
+    np.save(os.path.join(tmp, 'offsets.npy'), offsets.astype(np.int64))
+    for name, _ in ARCHIVE_COLUMNS:
+        np.save(os.path.join(tmp, f'{name}.npy'), columns[name])
+    for name, dictionary in dictionaries.items():
+        np.save(os.path.join(tmp, f'{name}.dict.npy'), dictionary_values(dictionary))
+        np.save(os.path.join(tmp, f'{name}.npy'), codes[name])
+    with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+        json.dump({'day': day_start, 'rows': total, 'max_id': max_id}, f)
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.rename(tmp, path)
+    return total
+
+
+def get_archived_max_id(day_start):
+    """
+    Id up to which the partials of the day starting at `day_start` are in
+    the archive, 0 for archives written before it was recorded.
+    """
+    with open(os.path.join(day_path(day_start), 'meta.json')) as f:
+        return json.load(f).get('max_id', 0)
+
+
+def archive_late_days():
+    """
+    Archive again the archived days still in the database that got partials
+    past their archived id. Returns the start timestamps of those days.
+    """
+    partitions = get_partitions()
+    days = []
+    for day_start in get_archived_days():
+        # Nothing is left of the days whose partition was dropped
+        if not any(
+            (start is None or start < day_start + DAY) and end > day_start for _, start, end in partitions
+        ):
+            continue
+        if Partial.objects.filter(
+            timestamp__gte=day_start, timestamp__lt=day_start + DAY, id__gt=get_archived_max_id(day_start),
+        ).exists():
+            archive_day(day_start)
+            days.append(day_start)
+    return days
+
+
+def read_day(day_start, launcher, start, end):
+    """
+    Partials of `launcher` between `start` and `end` from an archived day, as
+    tuples in the order of `export.PARTIAL_EXPORT_FIELDS`.
+    """
+    path = day_path(day_start)
+    with open(os.path.join(path, 'meta.json')) as f:
+        if not json.load(f)['rows']:
+            return
+
+    launchers = np.load(os.path.join(path, 'launchers.npy'), mmap_mode='r')
+    i = np.searchsorted(launchers, launcher.encode())
+    if i == len(launchers) or launchers[i] != launcher.encode():
+        return
+    offsets = np.load(os.path.join(path, 'offsets.npy'))
+    rows = slice(offsets[i], offsets[i + 1])
+
+    def column(name):
+        return np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r')[rows]
+
+    timestamps = column('timestamp')
+    selected = np.nonzero((timestamps >= start) & (timestamps < end))[0]
+    ids = column('id')[selected]
+    difficulties = column('difficulty')[selected]
+    strings = []
+    for name in ARCHIVE_DICT_COLUMNS:
+        # Only the values used by the selected rows are read and decoded
+        codes, inverse = np.unique(column(name)[selected], return_inverse=True)
+        values = [None] * len(codes)
+        if codes.size and codes[-1] >= 0:
+            dictionary = np.load(os.path.join(path, f'{name}.dict.npy'), mmap_mode='r')
+            values = [None if code < 0 else dictionary[code].decode() for code in codes]
+        strings.append([values[i] for i in inverse])
+
+    for n, row in enumerate(selected):
+        yield (
+            int(ids[n]), launcher, int(timestamps[row]), int(difficulties[n]),
+            *(values[n] for values in strings),
+        )
+
+
+def archived_rows(launcher, start, end):
+    for day_start in get_archived_days():
+        if day_start + DAY > start and day_start < end:
+            yield from read_day(day_start, launcher, start, end)
@@ -0,0 +1,50 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+
+logger = logging.getLogger('api.cache')
+
+
+def _revalidate(key, compute, ttl, stale_ttl):
+    try:
+        cache.set(key, (time.time() + ttl, compute()), ttl + stale_ttl)
+    except Exception:
+        logger.error('Failed to revalidate %s', key, exc_info=True)
+    finally:
+        cache.delete(f'{key}:lock')
+        connections.close_all()
+
+
+def stale_while_revalidate(key, compute, ttl=None, stale_ttl=None):
+    """
+    Return `compute()` through the cache.
+
+    Once an entry is older than `ttl` it is still served for up to
+    `stale_ttl` seconds while a single worker, the one that grabs the lock,
+    recomputes it in the background. A missing entry is computed inline,
+    without waiting on other workers.
+
+    The cache is only shared across workers with a redis/memcached/database
+    backend (`cache` in the settings file), the default LocMemCache keeps
+    one entry per process.
+    """
+    ttl = settings.STATS_CACHE_TTL if ttl is None else ttl
+    stale_ttl = settings.STATS_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+
+    entry = cache.get(key)
+    if entry is not None:
+        expires, value = entry
+        if time.time() >= expires and cache.add(f'{key}:lock', 1, 60):
+            threading.Thread(
+                target=_revalidate, args=(key, compute, ttl, stale_ttl), daemon=True,
+            ).start()
+        return value
+
+    value = compute()
+    cache.set(key, (time.time() + ttl, value), ttl + stale_ttl)
+    return value
@@ -0,0 +1,109 @@
+import hashlib
+
+from django.contrib.postgres.aggregates import StringAgg
+from django.db.models import BinaryField, Max
+from django.db.models.functions import MD5, Concat
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+from .models import (
+    Block,
+    GlobalInfo,
+    Launcher,
+    Notification,
+    Payout,
+    PayoutTransactionSummary,
+    PoolStatsSnapshot,
+    RollupWatermark,
+    Transaction,
+)
+from .serializers import NOTIFICATION_FIELDS
+from referral.models import Referral
+
+
+def block_version(request, *args, **kwargs):
+    return Block.objects.aggregate(height=Max('farmed_height'))['height']
+
+
+def payout_version(request, *args, **kwargs):
+    return Payout.objects.aggregate(id=Max('id'))['id']
+
+
+def transaction_version(request, *args, **kwargs):
+    return tuple(Transaction.objects.aggregate(
+        id=Max('id'), confirmed=Max('confirmed_block_index'),
+    ).values())
+
+
+def payout_transaction_version(request, *args, **kwargs):
+    # Changed transactions are rewritten, so the last id moves with them
+    return PayoutTransactionSummary.objects.aggregate(id=Max('id'))['id']
+
+
+def chain_version(request, *args, **kwargs):
+    return GlobalInfo.objects.filter(pk=1).values_list('blockchain_height', flat=True).first()
+
+
+def launcher_name_version(request, *args, **kwargs):
+    # The compact launcher payload only changes when a launcher is renamed
+    return Launcher.objects.filter(name__isnull=False).aggregate(
+        names=MD5(StringAgg(Concat('launcher_id', 'name'), ',', ordering='launcher_id')),
+    )['names']
+
+
+def block_launcher_version(request, *args, **kwargs):
+    # The full launcher payload changes with every partial
+    if 'farmed_by' in request.GET.get('expand', '').split(','):
+        return chain_version(request, *args, **kwargs)
+    return launcher_name_version(request, *args, **kwargs)
+
+
+def stats_last_modified(request, *args, **kwargs):
+    return PoolStatsSnapshot.objects.filter(pk=1).values_list('updated_at', flat=True).first()
+
+
+def leaderboard_version(request, *args, **kwargs):
+    return RollupWatermark.objects.filter(name='leaderboard').values_list('value', flat=True).first()
+
+
+def launcher_version(request, *args, pk=None, **kwargs):
+    fields = [i.attname for i in Launcher._meta.concrete_fields if not isinstance(i, BinaryField)]
+    version = Launcher.objects.filter(pk=pk).values_list(*fields).first()
+    if pk in (request.session.get('launcher_id'), request.auth and request.auth.launcher_id):
+        # The owner also gets the notification settings and the referrer
+        return (
+            version,
+            Notification.objects.filter(launcher=pk).values_list(*NOTIFICATION_FIELDS).first(),
+            tuple(Referral.objects.filter(launcher=pk, active=True).values_list('id', 'referrer_id')),
+        )
+    return version
+
+
+def conditional_get(*versions, last_modified=None, methods=('get', 'list', 'retrieve')):
+    """
+    Class decorator adding ETag (and optionally Last-Modified) support to the
+    read methods of a view, so unchanged data returns 304 without running the
+    view.
+
+    The ETag is derived from the given cheap version markers plus whatever
+    else the response depends on (negotiated format and the logged in
+    launcher, which sees private fields).
+    """
+
+    def etag(request, *args, **kwargs):
+        h = hashlib.sha1()
+        for version in versions:
+            h.update(repr(version(request, *args, **kwargs)).encode())
+        h.update(request.META.get('HTTP_ACCEPT', '').encode())
+        h.update(repr(request.session.get('launcher_id')).encode())
+        h.update(repr(request.auth and request.auth.launcher_id).encode())
+        return h.hexdigest()
+
+    decorator = condition(etag_func=etag, last_modified_func=last_modified)
+
+    def wrap(cls):
+        for name in methods:
+            if hasattr(cls, name):
+                cls = method_decorator(decorator, name=name)(cls)
+        return cls
+    return wrap
@@ -0,0 +1,76 @@
+import csv
+import io
+import itertools
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from .archive import archived_rows, archived_until
+from .models import Partial
+
+
+EXPORT_CHUNK_SIZE = 5000
+PARTIAL_EXPORT_FIELDS = (
+    'id',
+    'launcher_id',
+    'timestamp',
+    'difficulty',
+    'error',
+    'harvester_id',
+    'plot_id',
+    'chia_version',
+    'pool_host',
+)
+
+
+def partial_rows(launcher, start, end):
+    """
+    Partials of `launcher` between the `start` and `end` timestamps, read
+    from the archive up to the last archived day and from the database,
+    through a server side cursor, after it.
+    """
+    until = archived_until() if settings.PARTIAL_ARCHIVE_DIR else None
+    rows = Partial.objects.filter(
+        launcher=launcher, timestamp__gte=max(start, until or start), timestamp__lt=end,
+    ).order_by('timestamp', 'id').values_list(*PARTIAL_EXPORT_FIELDS).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE,
+    )
+    if until is None or start >= until:
+        return rows
+    return itertools.chain(archived_rows(launcher, start, min(end, until)), rows)
+
+
+async def batches(rows):
+    # The cursor lives on the request thread connection, so every batch is
+    # fetched on that same thread.
+    next_batch = sync_to_async(lambda: list(itertools.islice(rows, EXPORT_CHUNK_SIZE)))
+    while True:
+        batch = await next_batch()
+        if not batch:
+            return
+        yield batch
+
+
+async def ndjson_lines(rows):
+    async for batch in batches(rows):
+        yield ''.join(json.dumps(dict(zip(PARTIAL_EXPORT_FIELDS, row))) + '\n' for row in batch)
+
+
+async def csv_lines(rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(PARTIAL_EXPORT_FIELDS)
+    async for batch in batches(rows):
+        writer.writerows(batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_lines),
+    'csv': ('text/csv', csv_lines),
+}
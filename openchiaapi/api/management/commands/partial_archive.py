@@ -0,0 +1,38 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+
+from api.archive import archive_day, archive_late_days, archived_until
+from api.models import Partial
+from api.partitions import DAY
+
+logger = logging.getLogger('partial_archive')
+
+
+class Command(BaseCommand):
+    help = 'Write the partials of every complete day not archived yet to the partial archive.'
+
+    def handle(self, *args, **options):
+        if not settings.PARTIAL_ARCHIVE_DIR:
+            logger.info('No partial archive configured')
+            return
+
+        day = archived_until()
+        if day is None:
+            # Only the first run has to look for the oldest partial
+            first = Partial.objects.aggregate(timestamp=Min('timestamp'))['timestamp']
+            if first is None:
+                return
+            day = first // DAY * DAY
+
+        today = int(time.time()) // DAY * DAY
+        while day < today:
+            rows = archive_day(day)
+            logger.info('Archived %d partials of %s', rows, time.strftime('%Y-%m-%d', time.gmtime(day)))
+            day += DAY
+
+        for day in archive_late_days():
+            logger.info('Archived again %s, it got new partials', time.strftime('%Y-%m-%d', time.gmtime(day)))
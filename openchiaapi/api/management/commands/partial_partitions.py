@@ -0,0 +1,18 @@
+import logging
+
+from django.core.management.base import BaseCommand
+
+from api.partitions import create_partitions
+
+logger = logging.getLogger('partial_partitions')
+
+
+class Command(BaseCommand):
+    help = 'Create the upcoming daily partitions of the partial table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days-ahead', type=int, default=7)
+
+    def handle(self, *args, **options):
+        for name in create_partitions(options['days_ahead']):
+            logger.info('Created partition %s', name)
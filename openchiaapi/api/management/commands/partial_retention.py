@@ -0,0 +1,88 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from api.archive import archive_late_days, archived_until, get_archived_days, get_archived_max_id
+from api.models import Partial
+from api.partitions import DAY, drop_partitions
+from api.rollups import PARTIAL_ROLLUPS, get_watermark_value
+
+logger = logging.getLogger('partial_retention')
+
+# Partials younger than this are never removed
+MIN_AGE = DAY
+
+
+class Command(BaseCommand):
+    help = (
+        'Remove the partials older than the retention period once they are rolled up, '
+        'dropping whole partitions where possible.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int, default=None,
+            help='Keep this many days of partials (default: partial_retention_days setting).',
+        )
+        parser.add_argument(
+            '--detach', action='store_true',
+            help='Only detach expired partitions instead of dropping them.',
+        )
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        days = options['days'] if options['days'] is not None else settings.PARTIAL_RETENTION_DAYS
+        if days is None:
+            logger.info('No partial retention configured')
+            return
+        # Well past the rollup lag, so the watermarks are past the cutoff
+        before = int(time.time()) - max(days * DAY, MIN_AGE)
+        if settings.PARTIAL_ARCHIVE_DIR:
+            until = archived_until() or 0
+            if until < before:
+                logger.warning('Keeping the partials from %d on, they are not archived yet', until)
+                before = until
+
+        for rollup in PARTIAL_ROLLUPS.values():
+            while not rollup():
+                pass
+        # Partials past the watermarks are not rolled up, late commits
+        # included, they are kept whatever their age.
+        max_id = min(get_watermark_value(name) for name in PARTIAL_ROLLUPS)
+
+        # Nor are the partials committed after their day was archived
+        day_max_ids = {}
+        if settings.PARTIAL_ARCHIVE_DIR:
+            for day in archive_late_days():
+                logger.info('Archived again %s, it got new partials', time.strftime('%Y-%m-%d', time.gmtime(day)))
+            day_max_ids = {
+                day: min(max_id, get_archived_max_id(day)) for day in get_archived_days() if day < before
+            }
+
+        def partition_max_id(start, end):
+            return min([max_id] + [
+                day_max_id for day, day_max_id in day_max_ids.items()
+                if (start is None or day >= start) and day < end
+            ])
+
+        for name in drop_partitions(before, detach_only=options['detach'], max_id=partition_max_id):
+            logger.info('%s partition %s', 'Detached' if options['detach'] else 'Dropped', name)
+
+        # What is left lives in partitions straddling the cutoff
+        if settings.PARTIAL_ARCHIVE_DIR:
+            expired = [
+                Partial.objects.filter(timestamp__gte=day, timestamp__lt=min(day + DAY, before), id__lte=day_max_id)
+                for day, day_max_id in day_max_ids.items()
+            ]
+        else:
+            expired = [Partial.objects.filter(timestamp__lt=before, id__lte=max_id)]
+        deleted = 0
+        for partials in expired:
+            while True:
+                ids = list(partials.values_list('id', flat=True)[:options['batch_size']])
+                if not ids:
+                    break
+                deleted += partials.filter(id__in=ids).delete()[0]
+        logger.info('Deleted %d partials older than %d', deleted, before)
@@ -0,0 +1,67 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from api.rollups import (
+    update_block_effort,
+    update_daily_profitability,
+    update_harvester_partial_day,
+    update_launcher_daily_rewards,
+    update_launcher_partial_dimension_day,
+    update_launcher_partial_hour,
+    update_leaderboard,
+    update_partial_dimension_hour,
+    update_payout_transaction_summary,
+)
+from api.stats import refresh_pool_stats
+
+logger = logging.getLogger('refresh_stats')
+
+ROLLUPS = (
+    update_block_effort,
+    update_daily_profitability,
+    update_harvester_partial_day,
+    update_launcher_daily_rewards,
+    update_launcher_partial_dimension_day,
+    update_launcher_partial_hour,
+    update_leaderboard,
+    update_partial_dimension_hour,
+    update_payout_transaction_summary,
+)
+
+
+class Command(BaseCommand):
+    help = 'Update the stats rollups and the pool stats snapshot served by the stats endpoints.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep running, checking for new blocks and payouts every --interval seconds.',
+        )
+        parser.add_argument('--interval', type=int, default=5)
+        parser.add_argument(
+            '--max-age', type=int, default=60,
+            help='Rebuild even without new blocks or payouts once the snapshot is this old.',
+        )
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            for rollup in ROLLUPS:
+                rollup()
+            refresh_pool_stats()
+            return
+
+        while True:
+            close_old_connections()
+            for rollup in ROLLUPS:
+                try:
+                    rollup()
+                except Exception:
+                    logger.error('Failed to run %s', rollup.__name__, exc_info=True)
+            try:
+                refresh_pool_stats(max_age=options['max_age'])
+            except Exception:
+                logger.error('Failed to refresh pool stats', exc_info=True)
+            time.sleep(options['interval'])
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0046_delete_space'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PoolStatsSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(default=None, null=True)),
+                ('last_block_id', models.BigIntegerField(default=None, null=True)),
+                ('last_payout_id', models.BigIntegerField(default=None, null=True)),
+                ('fee', models.DecimalField(decimal_places=5, default=0, max_digits=6)),
+                ('blockchain_height', models.BigIntegerField(default=0)),
+                ('blockchain_space', models.CharField(default='0', max_length=128)),
+                ('blockchain_mempool_full_pct', models.IntegerField(default=0)),
+                ('pool_space', models.BigIntegerField(default=0)),
+                ('estimate_win', models.BigIntegerField(default=-1)),
+                ('farmers', models.IntegerField(default=0)),
+                ('farmers_active', models.IntegerField(default=0)),
+                ('rewards_amount', models.BigIntegerField(default=0)),
+                ('rewards_blocks', models.IntegerField(default=0)),
+                ('last_rewards', models.JSONField(default=list)),
+                ('average_effort', models.FloatField(default=None, null=True)),
+                ('xch_tb_month', models.FloatField(default=0)),
+                ('xch_current_price', models.JSONField(default=dict)),
+                ('pool_wallets', models.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'pool_stats_snapshot',
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0047_pool_stats_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyProfitability',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('blocks', models.IntegerField(default=0)),
+                ('xch_tb', models.FloatField(default=0)),
+            ],
+            options={
+                'db_table': 'daily_profitability',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('name', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'rollup_watermark',
+            },
+        ),
+    ]
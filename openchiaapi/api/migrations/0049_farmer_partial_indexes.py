@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0048_daily_profitability'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='launcher',
+            index=models.Index(condition=models.Q(('is_pool_member', True)), fields=['points_pplns'], name='farmer_pool_member_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='launcher',
+            index=models.Index(condition=models.Q(('points_pplns__gt', 0)), fields=['is_pool_member'], name='farmer_active_idx'),
+        ),
+    ]
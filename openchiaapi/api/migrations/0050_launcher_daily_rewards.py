@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0049_farmer_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LauncherDailyRewards',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('amount', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'launcher_daily_rewards',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='payout',
+            index=models.Index(fields=['datetime'], name='payout_datetime_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='payoutaddress',
+            index=models.Index(fields=['launcher', 'payout'], name='payout_address_launcher_idx'),
+        ),
+        migrations.AddField(
+            model_name='launcherdailyrewards',
+            name='launcher',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.launcher'),
+        ),
+        migrations.AddConstraint(
+            model_name='launcherdailyrewards',
+            constraint=models.UniqueConstraint(fields=('launcher', 'date'), name='launcher_daily_rewards_uniq'),
+        ),
+    ]
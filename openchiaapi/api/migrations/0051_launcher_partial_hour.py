@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:32
+
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0050_launcher_daily_rewards'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LauncherPartialHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.IntegerField()),
+                ('successful', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('points', models.BigIntegerField(default=0)),
+                ('harvesters', django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=64), default=list, size=None)),
+                ('launcher', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.launcher')),
+            ],
+            options={
+                'db_table': 'launcher_partial_hour',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='launcherpartialhour',
+            constraint=models.UniqueConstraint(fields=('launcher', 'hour'), name='launcher_partial_hour_uniq'),
+        ),
+    ]
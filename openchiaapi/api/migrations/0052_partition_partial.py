@@ -0,0 +1,99 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:32
+
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Turn partial into a table range partitioned by timestamp. The existing
+# table is kept as is and attached as the partition holding everything up to
+# the end of the day it was migrated on, new days get their own partition.
+PARTITION_PARTIAL = """
+DO $$
+DECLARE
+    old_seq regclass := pg_get_serial_sequence('partial', 'id')::regclass;
+    next_id bigint;
+    legacy_end integer;
+    day_start integer;
+    idx regclass;
+BEGIN
+    LOCK TABLE partial IN ACCESS EXCLUSIVE MODE;
+
+    -- Detach the id sequence from the old table, it works for both serial
+    -- and identity columns.
+    next_id := nextval(old_seq);
+    IF EXISTS (
+        SELECT 1 FROM pg_attribute
+        WHERE attrelid = 'partial'::regclass AND attname = 'id' AND attidentity != ''
+    ) THEN
+        ALTER TABLE partial ALTER COLUMN id DROP IDENTITY;
+    ELSE
+        ALTER TABLE partial ALTER COLUMN id DROP DEFAULT;
+        EXECUTE format('DROP SEQUENCE %s', old_seq);
+    END IF;
+
+    ALTER TABLE partial RENAME TO partial_legacy;
+    -- Replaced by the (id, timestamp) key of the partitioned table
+    ALTER TABLE partial_legacy DROP CONSTRAINT partial_pkey;
+    FOR idx IN
+        SELECT indexrelid::regclass FROM pg_index
+        WHERE indrelid = 'partial_legacy'::regclass AND NOT indisunique
+    LOOP
+        EXECUTE format('DROP INDEX %s', idx);
+    END LOOP;
+
+    CREATE TABLE partial (LIKE partial_legacy INCLUDING DEFAULTS) PARTITION BY RANGE (timestamp);
+    CREATE SEQUENCE partial_id_seq OWNED BY partial.id;
+    PERFORM setval('partial_id_seq', next_id, false);
+    ALTER TABLE partial ALTER COLUMN id SET DEFAULT nextval('partial_id_seq');
+    ALTER TABLE partial ADD CONSTRAINT partial_pkey PRIMARY KEY (id, timestamp);
+    ALTER TABLE partial ADD CONSTRAINT partial_launcher_id_fk_farmer_launcher_id
+        FOREIGN KEY (launcher_id) REFERENCES farmer (launcher_id) DEFERRABLE INITIALLY DEFERRED;
+
+    SELECT GREATEST(
+        extract(epoch FROM date_trunc('day', now() AT TIME ZONE 'UTC'))::integer,
+        COALESCE(max(timestamp), 0)
+    ) INTO legacy_end FROM partial_legacy;
+    legacy_end := legacy_end - legacy_end % 86400 + 86400;
+    EXECUTE format(
+        'ALTER TABLE partial ATTACH PARTITION partial_legacy FOR VALUES FROM (MINVALUE) TO (%s)',
+        legacy_end
+    );
+
+    CREATE TABLE partial_default PARTITION OF partial DEFAULT;
+    FOR i IN 0..6 LOOP
+        day_start := legacy_end + i * 86400;
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF partial FOR VALUES FROM (%s) TO (%s)',
+            'partial_p' || to_char(to_timestamp(day_start) AT TIME ZONE 'UTC', 'YYYYMMDD'),
+            day_start,
+            day_start + 86400
+        );
+    END LOOP;
+END
+$$;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0051_launcher_partial_hour'),
+    ]
+
+    operations = [
+        migrations.RunSQL(PARTITION_PARTIAL),
+        migrations.AlterField(
+            model_name='partial',
+            name='launcher',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.launcher'),
+        ),
+        migrations.AddIndex(
+            model_name='partial',
+            index=models.Index(fields=['launcher', 'timestamp'], name='partial_launcher_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='partial',
+            index=django.contrib.postgres.indexes.BrinIndex(fields=['timestamp'], name='partial_timestamp_brin'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0052_partition_partial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Leaderboard',
+            fields=[
+                ('launcher', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='api.launcher')),
+                ('rank', models.IntegerField(unique=True)),
+                ('name', models.CharField(max_length=200, null=True)),
+                ('points_pplns', models.BigIntegerField()),
+                ('share_pplns', models.DecimalField(decimal_places=20, max_digits=21)),
+                ('estimated_size', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'leaderboard',
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:39
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0054_farmer_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlockEffortStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('updated_at', models.DateTimeField(default=None, null=True)),
+                ('bins', models.JSONField(default=list)),
+                ('windows', models.JSONField(default=dict)),
+            ],
+            options={
+                'db_table': 'block_effort_stats',
+            },
+        ),
+        migrations.CreateModel(
+            name='LauncherEffort',
+            fields=[
+                ('launcher', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, serialize=False, to='api.launcher')),
+                ('blocks', models.IntegerField(default=0)),
+                ('effort_sum', models.BigIntegerField(default=0)),
+                ('best_effort', models.IntegerField()),
+                ('last_effort', models.IntegerField()),
+                ('last_timestamp', models.BigIntegerField()),
+            ],
+            options={
+                'db_table': 'launcher_effort',
+            },
+        ),
+    ]
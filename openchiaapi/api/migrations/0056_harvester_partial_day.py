@@ -0,0 +1,34 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0055_block_effort'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HarvesterPartialDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('harvester_id', models.CharField(max_length=64)),
+                ('successful', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('points', models.BigIntegerField(default=0)),
+                ('last_seen', models.IntegerField()),
+                ('launcher', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.launcher')),
+            ],
+            options={
+                'db_table': 'harvester_partial_day',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='harvesterpartialday',
+            constraint=models.UniqueConstraint(fields=('launcher', 'date', 'harvester_id'), name='harvester_partial_day_uniq'),
+        ),
+    ]
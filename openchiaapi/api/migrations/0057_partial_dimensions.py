@@ -0,0 +1,57 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0056_harvester_partial_day'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LauncherPartialDimensionDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=16)),
+                ('value', models.CharField(max_length=64)),
+                ('date', models.DateField()),
+                ('partials', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('points', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'launcher_partial_dimension_day',
+            },
+        ),
+        migrations.CreateModel(
+            name='PartialDimensionHour',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dimension', models.CharField(max_length=16)),
+                ('value', models.CharField(max_length=64)),
+                ('hour', models.IntegerField()),
+                ('partials', models.IntegerField(default=0)),
+                ('failed', models.IntegerField(default=0)),
+                ('points', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'partial_dimension_hour',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='partialdimensionhour',
+            constraint=models.UniqueConstraint(fields=('dimension', 'hour', 'value'), name='partial_dimension_hour_uniq'),
+        ),
+        migrations.AddField(
+            model_name='launcherpartialdimensionday',
+            name='launcher',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='api.launcher'),
+        ),
+        migrations.AddConstraint(
+            model_name='launcherpartialdimensionday',
+            constraint=models.UniqueConstraint(fields=('launcher', 'dimension', 'date', 'value'), name='launcher_partial_dimension_day_uniq'),
+        ),
+    ]
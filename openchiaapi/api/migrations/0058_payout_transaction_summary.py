@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:47
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0057_partial_dimensions'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PayoutTransactionSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.BigIntegerField()),
+                ('transaction_name', models.CharField(max_length=64, null=True)),
+                ('created_at_time', models.DateTimeField(null=True)),
+                ('xch_price', models.JSONField(default=None, null=True)),
+                ('confirmed_block_index', models.IntegerField(default=None, null=True)),
+                ('launcher', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='api.launcher')),
+                ('transaction', models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, to='api.transaction')),
+            ],
+            options={
+                'db_table': 'payout_transaction_summary',
+                'indexes': [models.Index(fields=['launcher', 'transaction'], name='payout_tx_summary_launcher_idx'), models.Index(fields=['-transaction', 'launcher'], name='payout_tx_summary_tx_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 04:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0058_payout_transaction_summary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['confirmed_block_index'], name='transaction_confirmed_idx'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:12
+
+from django.db import migrations
+
+
+def reset_launcher_daily_rewards(apps, schema_editor):
+    # The watermark moves from payout to payout address ids, the rewards are
+    # rebuilt by the next refresh_stats run.
+    apps.get_model('api', 'LauncherDailyRewards').objects.all().delete()
+    apps.get_model('api', 'RollupWatermark').objects.filter(name='launcher_daily_rewards').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0059_transaction_confirmed_idx'),
+    ]
+
+    operations = [
+        migrations.RunPython(reset_launcher_daily_rewards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.30 on 2026-10-18 05:13
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0060_reset_launcher_daily_rewards'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='launcher',
+            name='farmer_active_idx',
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 
 
@@ -36,6 +38,15 @@ class Launcher(models.Model):
 
     class Meta:
         db_table = 'farmer'
+        indexes = [
+            models.Index(
+                name='farmer_pool_member_idx',
+                fields=['points_pplns'],
+                condition=models.Q(is_pool_member=True),
+            ),
+            # Matches the UPPER() used by icontains, for the launcher search
+            GinIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='farmer_name_trgm_idx'),
+        ]
 
     launcher_id = models.CharField(primary_key=True, max_length=64)
     name = models.CharField(max_length=200, null=True)
@@ -135,10 +146,16 @@ class Singleton(models.Model):
 
 class Partial(models.Model):
 
+    # Range partitioned by timestamp (one partition per day), see
+    # api.partitions and the partial_partitions command.
     class Meta:
         db_table = 'partial'
+        indexes = [
+            models.Index(name='partial_launcher_ts_idx', fields=['launcher', 'timestamp']),
+            BrinIndex(name='partial_timestamp_brin', fields=['timestamp']),
+        ]
 
-    launcher = models.ForeignKey(Launcher, on_delete=models.CASCADE)
+    launcher = models.ForeignKey(Launcher, on_delete=models.CASCADE, db_index=False)
     timestamp = models.IntegerField()
     difficulty = models.IntegerField()
     error = models.CharField(max_length=25, null=True, default=None)
@@ -164,6 +181,9 @@ class Payout(models.Model):
 
     class Meta:
         db_table = 'payout'
+        indexes = [
+            models.Index(name='payout_datetime_idx', fields=['datetime']),
+        ]
 
     datetime = models.DateTimeField(default=timezone.now)
     amount = models.BigIntegerField()
@@ -184,6 +204,9 @@ class Transaction(models.Model):
 
     class Meta:
         db_table = 'transaction'
+        indexes = [
+            models.Index(name='transaction_confirmed_idx', fields=['confirmed_block_index']),
+        ]
 
     transaction = models.CharField(max_length=64, unique=True)
     created_at_time = models.DateTimeField(null=True)
@@ -195,6 +218,9 @@ class PayoutAddress(models.Model):
 
     class Meta:
         db_table = 'payout_address'
+        indexes = [
+            models.Index(name='payout_address_launcher_idx', fields=['launcher', 'payout']),
+        ]
 
     payout = models.ForeignKey(Payout, on_delete=models.CASCADE)
     fee = models.BooleanField(default=False)
@@ -209,6 +235,26 @@ class PayoutAddress(models.Model):
     transaction = models.ForeignKey(Transaction, null=True, on_delete=models.SET_NULL)
 
 
+class PayoutTransactionSummary(models.Model):
+
+    class Meta:
+        db_table = 'payout_transaction_summary'
+        indexes = [
+            models.Index(name='payout_tx_summary_launcher_idx', fields=['launcher', 'transaction']),
+            models.Index(name='payout_tx_summary_tx_idx', fields=['-transaction', 'launcher']),
+        ]
+
+    # Payout addresses amounts per transaction (NULL while not sent yet) and
+    # launcher, with the transaction fields copied over.
+    transaction = models.ForeignKey(Transaction, null=True, on_delete=models.CASCADE, db_index=False)
+    launcher = models.ForeignKey(Launcher, null=True, on_delete=models.CASCADE, db_index=False)
+    amount = models.BigIntegerField()
+    transaction_name = models.CharField(max_length=64, null=True)
+    created_at_time = models.DateTimeField(null=True)
+    xch_price = models.JSONField(default=None, null=True)
+    confirmed_block_index = models.IntegerField(null=True, default=None)
+
+
 class SingletonModel(models.Model):
 
     class Meta:
@@ -237,3 +283,175 @@ class GlobalInfo(SingletonModel):
     blockchain_avg_block_time = models.BigIntegerField(default=0, null=True)
     xch_current_price = models.JSONField(default=dict)
     wallets = models.JSONField(default=dict)
+
+
+class PoolStatsSnapshot(SingletonModel):
+
+    class Meta:
+        db_table = 'pool_stats_snapshot'
+
+    updated_at = models.DateTimeField(default=None, null=True)
+    last_block_id = models.BigIntegerField(default=None, null=True)
+    last_payout_id = models.BigIntegerField(default=None, null=True)
+    fee = models.DecimalField(max_digits=6, decimal_places=5, default=0)
+    blockchain_height = models.BigIntegerField(default=0)
+    blockchain_space = models.CharField(default='0', max_length=128)
+    blockchain_mempool_full_pct = models.IntegerField(default=0)
+    pool_space = models.BigIntegerField(default=0)
+    estimate_win = models.BigIntegerField(default=-1)
+    farmers = models.IntegerField(default=0)
+    farmers_active = models.IntegerField(default=0)
+    rewards_amount = models.BigIntegerField(default=0)
+    rewards_blocks = models.IntegerField(default=0)
+    last_rewards = models.JSONField(default=list)
+    average_effort = models.FloatField(default=None, null=True)
+    xch_tb_month = models.FloatField(default=0)
+    xch_current_price = models.JSONField(default=dict)
+    pool_wallets = models.JSONField(default=dict)
+
+
+class RollupWatermark(models.Model):
+
+    class Meta:
+        db_table = 'rollup_watermark'
+
+    name = models.CharField(max_length=64, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+
+class BlockEffortStats(SingletonModel):
+
+    class Meta:
+        db_table = 'block_effort_stats'
+
+    updated_at = models.DateTimeField(default=None, null=True)
+    # Upper edges of the effort histogram bins, the last bin has no upper edge
+    bins = models.JSONField(default=list)
+    # Effort stats and histogram per window, keyed by number of days
+    windows = models.JSONField(default=dict)
+
+
+class DailyProfitability(models.Model):
+
+    class Meta:
+        db_table = 'daily_profitability'
+
+    date = models.DateField(unique=True)
+    blocks = models.IntegerField(default=0)
+    xch_tb = models.FloatField(default=0)
+
+
+class LauncherDailyRewards(models.Model):
+
+    class Meta:
+        db_table = 'launcher_daily_rewards'
+        constraints = [
+            models.UniqueConstraint(name='launcher_daily_rewards_uniq', fields=['launcher', 'date']),
+        ]
+
+    launcher = models.ForeignKey(Launcher, on_delete=models.CASCADE, db_index=False)
+    date = models.DateField()
+    amount = models.BigIntegerField(default=0)
+
+
+class LauncherPartialHour(models.Model):
+
+    class Meta:
+        db_table = 'launcher_partial_hour'
+        constraints = [
+            models.UniqueConstraint(name='launcher_partial_hour_uniq', fields=['launcher', 'hour']),
+        ]
+
+    launcher = models.ForeignKey(Launcher, on_delete=models.CASCADE, db_index=False)
+    # Timestamp of the start of the hour
+    hour = models.IntegerField()
+    successful = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    points = models.BigIntegerField(default=0)
+    harvesters = ArrayField(models.CharField(max_length=64), default=list)
+
+
+class Leaderboard(models.Model):
+
+    class Meta:
+        db_table = 'leaderboard'
+
+    launcher = models.OneToOneField(Launcher, on_delete=models.CASCADE, primary_key=True)
+    rank = models.IntegerField(unique=True)
+    name = models.CharField(max_length=200, null=True)
+    points_pplns = models.BigIntegerField()
+    share_pplns = models.DecimalField(max_digits=21, decimal_places=20)
+    estimated_size = models.BigIntegerField()
+
+
+class LauncherEffort(models.Model):
+
+    class Meta:
+        db_table = 'launcher_effort'
+
+    launcher = models.OneToOneField(Launcher, on_delete=models.CASCADE, primary_key=True)
+    blocks = models.IntegerField(default=0)
+    effort_sum = models.BigIntegerField(default=0)
+    best_effort = models.IntegerField()
+    last_effort = models.IntegerField()
+    last_timestamp = models.BigIntegerField()
+
+
+class HarvesterPartialDay(models.Model):
+
+    class Meta:
+        db_table = 'harvester_partial_day'
+        constraints = [
+            models.UniqueConstraint(
+                name='harvester_partial_day_uniq', fields=['launcher', 'date', 'harvester_id'],
+            ),
+        ]
+
+    launcher = models.ForeignKey(Launcher, on_delete=models.CASCADE, db_index=False)
+    date = models.DateField()
+    harvester_id = models.CharField(max_length=64)
+    successful = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    points = models.BigIntegerField(default=0)
+    last_seen = models.IntegerField()
+
+
+class PartialDimensionHour(models.Model):
+
+    class Meta:
+        db_table = 'partial_dimension_hour'
+        constraints = [
+            models.UniqueConstraint(
+                name='partial_dimension_hour_uniq', fields=['dimension', 'hour', 'value'],
+            ),
+        ]
+
+    # Partial column (error, chia_version or pool_host) and its value, empty
+    # when not set.
+    dimension = models.CharField(max_length=16)
+    value = models.CharField(max_length=64)
+    # Timestamp of the start of the hour
+    hour = models.IntegerField()
+    partials = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    points = models.BigIntegerField(default=0)
+
+
+class LauncherPartialDimensionDay(models.Model):
+
+    class Meta:
+        db_table = 'launcher_partial_dimension_day'
+        constraints = [
+            models.UniqueConstraint(
+                name='launcher_partial_dimension_day_uniq',
+                fields=['launcher', 'dimension', 'date', 'value'],
+            ),
+        ]
+
+    launcher = models.ForeignKey(Launcher, on_delete=models.CASCADE, db_index=False)
+    dimension = models.CharField(max_length=16)
+    value = models.CharField(max_length=64)
+    date = models.DateField()
+    partials = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    points = models.BigIntegerField(default=0)
@@ -0,0 +1,141 @@
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination positioned on all the ordering fields, which should
+    be unique together, rather than only on the first one. NULLs sort as
+    the greatest value, as PostgreSQL does by default.
+    """
+    page_size_query_param = 'limit'
+
+    def get_ordering(self, request, queryset, view):
+        # ?ordering= is ignored, it could position the cursor on a nullable or
+        # non unique field.
+        if isinstance(self.ordering, str):
+            return (self.ordering,)
+        return tuple(self.ordering)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = []
+        for order in ordering:
+            name = order.lstrip('-')
+            if isinstance(instance, dict):
+                values.append(instance[name])
+            else:
+                # Foreign keys are positioned by their id, not the related object
+                values.append(getattr(instance, instance._meta.get_field(name).attname))
+        return json.dumps(values, cls=DjangoJSONEncoder)
+
+    def position_filter(self, ordering, position):
+        """
+        Rows following `position` in `ordering`.
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(values, list) or len(values) != len(ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        following = Q(pk__in=[])
+        equal = Q()
+        for order, value in zip(ordering, values):
+            name = order.lstrip('-')
+            if order.startswith('-'):
+                after = Q(**{f'{name}__isnull': False}) if value is None else Q(**{f'{name}__lt': value})
+            else:
+                after = Q(pk__in=[]) if value is None else (
+                    Q(**{f'{name}__gt': value}) | Q(**{f'{name}__isnull': True})
+                )
+            following |= equal & after
+            equal &= Q(**{f'{name}__isnull': True}) if value is None else Q(**{name: value})
+        return following
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.position_filter(ordering, current_position))
+
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+
+class HybridPagination(LimitOffsetPagination):
+    """
+    Limit/offset pagination unless the request asks for cursor pagination
+    with `pagination=cursor` (or follows a `cursor` link), in which case
+    pages are read by position on the view ordering without OFFSET or
+    COUNT.
+
+    Views without an ordering filter backend, or whose ordering is not
+    unique, can set `cursor_ordering`.
+    """
+    cursor_paginator = None
+
+    def use_cursor(self, request):
+        return 'cursor' in request.query_params or request.query_params.get('pagination') == 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.use_cursor(request):
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = KeysetPagination()
+        self.cursor_paginator.ordering = getattr(view, 'cursor_ordering', None) or view.ordering
+        return self.cursor_paginator.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_html_context(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_html_context()
+        return super().get_html_context()
@@ -0,0 +1,112 @@
+import datetime
+import logging
+import re
+
+from django.db import connection, transaction
+
+
+logger = logging.getLogger('api.partitions')
+
+DAY = 60 * 60 * 24
+BOUND_RE = re.compile(r'FROM \((\w+)\) TO \((\w+)\)')
+
+
+def partition_name(day_start):
+    day = datetime.datetime.fromtimestamp(day_start, datetime.timezone.utc)
+    return f'partial_p{day:%Y%m%d}'
+
+
+def get_partitions():
+    """
+    Range partitions of the partial table as (name, start, end) sorted by
+    start, with None for an unbounded side. The default partition is left
+    out.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute('''
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid)
+            FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = 'partial'::regclass
+        ''')
+        rows = cursor.fetchall()
+
+    partitions = []
+    for name, bound in rows:
+        match = BOUND_RE.search(bound)
+        if not match:
+            continue
+        start, end = (None if i == 'MINVALUE' else int(i) for i in match.groups())
+        partitions.append((name, start, end))
+    return sorted(partitions, key=lambda i: i[1] if i[1] is not None else -1)
+
+
+def create_partition(start, end):
+    name = partition_name(start)
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM partial_default WHERE timestamp >= %s AND timestamp < %s)',
+            [start, end],
+        )
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f'CREATE TABLE {name} PARTITION OF partial FOR VALUES FROM ({start}) TO ({end})'
+            )
+            return name
+
+        # Rows already landed in the default partition for this range, they
+        # have to be moved before the partition can be created.
+        logger.warning('Moving rows from partial_default to %s', name)
+        cursor.execute('ALTER TABLE partial DETACH PARTITION partial_default')
+        cursor.execute(f'CREATE TABLE {name} PARTITION OF partial FOR VALUES FROM ({start}) TO ({end})')
+        cursor.execute(
+            'INSERT INTO partial SELECT * FROM partial_default WHERE timestamp >= %s AND timestamp < %s',
+            [start, end],
+        )
+        cursor.execute(
+            'DELETE FROM partial_default WHERE timestamp >= %s AND timestamp < %s', [start, end],
+        )
+        cursor.execute('ALTER TABLE partial ATTACH PARTITION partial_default DEFAULT')
+    return name
+
+
+def create_partitions(days_ahead):
+    """
+    Make sure there is a daily partition from the end of the last one until
+    `days_ahead` days from now.
+    """
+    partitions = get_partitions()
+    start = partitions[-1][2] if partitions else None
+    today = int(datetime.datetime.now(datetime.timezone.utc).timestamp()) // DAY * DAY
+    if start is None:
+        start = today
+
+    created = []
+    while start < today + (days_ahead + 1) * DAY:
+        created.append(create_partition(start, start + DAY))
+        start += DAY
+    return created
+
+
+def drop_partitions(before, detach_only=False, max_id=None):
+    """
+    Detach, and unless `detach_only` drop, the partitions holding only
+    partials older than the `before` timestamp, and with ids up to `max_id`
+    if given, an id or a function of the partition start and end returning
+    one.
+    """
+    removed = []
+    for name, start, end in get_partitions():
+        if end is None or end > before:
+            continue
+        partition_max_id = max_id(start, end) if callable(max_id) else max_id
+        with transaction.atomic(), connection.cursor() as cursor:
+            if partition_max_id is not None:
+                cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {name} WHERE id > %s)', [partition_max_id])
+                if cursor.fetchone()[0]:
+                    logger.warning('Keeping %s, it holds partials past id %d', name, partition_max_id)
+                    continue
+            cursor.execute(f'ALTER TABLE partial DETACH PARTITION {name}')
+            if not detach_only:
+                cursor.execute(f'DROP TABLE {name}')
+        removed.append(name)
+    return removed
@@ -0,0 +1,664 @@
+import datetime
+import time
+from collections import defaultdict
+
+import numpy as np
+from django.contrib.postgres.aggregates import ArrayAgg
+from django.db import transaction
+from django.db.models import Count, DateTimeField, F, FloatField, Func, Max, Q, Sum, Value, Window
+from django.db.models.functions import Cast, Coalesce, Mod, RowNumber, TruncDate
+from django.utils import timezone
+
+from .models import (
+    Block,
+    BlockEffortStats,
+    DailyProfitability,
+    HarvesterPartialDay,
+    Launcher,
+    LauncherEffort,
+    Leaderboard,
+    LauncherDailyRewards,
+    LauncherPartialDimensionDay,
+    LauncherPartialHour,
+    Partial,
+    PartialDimensionHour,
+    PayoutAddress,
+    PayoutTransactionSummary,
+    RollupWatermark,
+    Transaction,
+)
+
+
+PARTIAL_BATCH_SIZE = 200000
+# Batches per rollup call, a backfill goes on in the next refresh_stats runs
+PARTIAL_MAX_BATCHES = 5
+# Partials are only rolled up once received this many seconds ago, as ids of
+# partials inserted concurrently can commit out of order.
+PARTIAL_ROLLUP_LAG = 60
+PARTIAL_DIMENSIONS = ('error', 'chia_version', 'pool_host')
+LEADERBOARD_INTERVAL = 60
+EFFORT_WINDOWS = (7, 30, 90, 365)
+# Upper edges of the effort (%) histogram bins, one more bin holds the rest
+EFFORT_BINS = list(range(25, 525, 25))
+EFFORT_MAX_AGE = 60 * 60
+
+# UTC day of a partial
+PARTIAL_DATE = TruncDate(Func('timestamp', function='TO_TIMESTAMP', output_field=DateTimeField()))
+
+# XCH won per TiB of pool space for a single block
+XCH_TB = (
+    Cast('amount', FloatField()) * 1099511627776 /
+    (Cast('pool_space', FloatField()) * 1000000000000)
+)
+
+
+def get_watermark(name, for_update=False):
+    qs = RollupWatermark.objects
+    if for_update:
+        qs = qs.select_for_update()
+    watermark, _ = qs.get_or_create(name=name)
+    return watermark
+
+
+def get_watermark_value(name):
+    return RollupWatermark.objects.filter(name=name).values_list('value', flat=True).first() or 0
+
+
+def merge_counters(model, keys, rows, fields, combine=None):
+    """
+    Merge `rows` (dicts with the `keys` and `fields` of `model`) into the
+    existing rows of `model`, adding up `fields` or merging them with the
+    `combine` function given for a field.
+    """
+    if not rows:
+        return
+    combine = combine or {}
+    lookup = Q()
+    for key in keys:
+        lookup &= Q(**{f'{key}__in': {row[key] for row in rows}})
+    existing = {
+        tuple(getattr(obj, key) for key in keys): obj for obj in model.objects.filter(lookup)
+    }
+
+    create = []
+    update = []
+    for row in rows:
+        obj = existing.get(tuple(row[key] for key in keys))
+        if obj is None:
+            create.append(model(**row))
+            continue
+        for field in fields:
+            merge = combine.get(field, lambda a, b: a + b)
+            setattr(obj, field, merge(getattr(obj, field), row[field]))
+        update.append(obj)
+
+    model.objects.bulk_create(create, batch_size=1000)
+    model.objects.bulk_update(update, fields, batch_size=1000)
+
+
+def day_range(date):
+    start = datetime.datetime.combine(date, datetime.time(), tzinfo=datetime.timezone.utc)
+    return int(start.timestamp()), int((start + datetime.timedelta(days=1)).timestamp())
+
+
+def update_daily_profitability():
+    """
+    Recompute the profitability of the days that got new blocks since the
+    last run.
+    """
+    with transaction.atomic():
+        watermark = get_watermark('daily_profitability', for_update=True)
+        new_blocks = Block.objects.filter(id__gt=watermark.value)
+        last_id = new_blocks.aggregate(id=Max('id'))['id']
+        if last_id is None:
+            return
+
+        days = {
+            datetime.datetime.fromtimestamp(i, datetime.timezone.utc).date()
+            for i in new_blocks.values_list('timestamp', flat=True)
+        }
+        for date in days:
+            start, end = day_range(date)
+            blocks = Block.objects.filter(timestamp__gte=start, timestamp__lt=end, pool_space__gt=0)
+            totals = blocks.aggregate(blocks=Count('id'), xch_tb=Sum(XCH_TB))
+            DailyProfitability.objects.update_or_create(date=date, defaults={
+                'blocks': totals['blocks'],
+                'xch_tb': totals['xch_tb'] or 0,
+            })
+
+        watermark.value = last_id
+        watermark.save()
+
+
+def get_profitability_history(days):
+    """
+    Daily profitability for the last `days` days along with the 30 days
+    rolling average (`xch_tb_month`) as of each day.
+    """
+    today = datetime.datetime.now(datetime.timezone.utc).date()
+    first = today - datetime.timedelta(days=days - 1)
+    history = {
+        i.date: i for i in DailyProfitability.objects.filter(
+            date__gt=first - datetime.timedelta(days=30),
+        )
+    }
+
+    def xch_tb(date):
+        return history[date].xch_tb if date in history else 0
+
+    result = []
+    window = sum(xch_tb(first - datetime.timedelta(days=i)) for i in range(1, 30))
+    for i in range(days):
+        date = first + datetime.timedelta(days=i)
+        window += xch_tb(date)
+        result.append({
+            'date': date,
+            'blocks': history[date].blocks if date in history else 0,
+            'xch_tb': xch_tb(date),
+            'xch_tb_month': window / 30,
+        })
+        window -= xch_tb(date - datetime.timedelta(days=29))
+    return result
+
+
+def update_launcher_daily_rewards():
+    """
+    Add the payout addresses created since the last run to the per launcher
+    daily rewards.
+    """
+    with transaction.atomic():
+        # Keyed on the payout addresses, which may be added after their payout
+        watermark = get_watermark('launcher_daily_rewards', for_update=True)
+        last_id = PayoutAddress.objects.filter(id__gt=watermark.value).aggregate(id=Max('id'))['id']
+        if last_id is None:
+            return
+
+        rows = PayoutAddress.objects.filter(
+            id__gt=watermark.value, id__lte=last_id, launcher__isnull=False,
+        ).annotate(date=TruncDate('payout__datetime')).values('launcher_id', 'date').annotate(
+            amount=Sum('amount'),
+        ).order_by()
+        merge_counters(LauncherDailyRewards, ('launcher_id', 'date'), list(rows), ('amount',))
+
+        watermark.value = last_id
+        watermark.save()
+
+
+def update_payout_transaction_summary():
+    """
+    Recompute the payout transaction summary of the transactions that may
+    have changed since the last run: the ones of new payout addresses, new
+    or unconfirmed transactions and the payouts not sent yet. Confirmed
+    transactions are final and never read again.
+    """
+    with transaction.atomic():
+        watermark = get_watermark('payout_transaction_summary', for_update=True)
+        tx_watermark = get_watermark('payout_transaction_summary_tx', for_update=True)
+        last_id = PayoutAddress.objects.aggregate(id=Max('id'))['id'] or 0
+        last_tx_id = Transaction.objects.aggregate(id=Max('id'))['id'] or 0
+
+        transactions = set(PayoutAddress.objects.filter(
+            id__gt=watermark.value, id__lte=last_id,
+        ).order_by().values_list('transaction_id', flat=True).distinct())
+        transactions |= set(Transaction.objects.filter(
+            Q(id__gt=tx_watermark.value) | Q(confirmed_block_index__isnull=True),
+        ).values_list('id', flat=True))
+        transactions |= set(PayoutTransactionSummary.objects.filter(
+            confirmed_block_index__isnull=True,
+        ).order_by().values_list('transaction_id', flat=True).distinct())
+        transactions.discard(None)
+
+        # Payouts not sent yet are always recomputed, the set is small
+        lookup = Q(transaction_id__in=transactions) | Q(transaction_id__isnull=True)
+        details = {
+            i['id']: i for i in Transaction.objects.filter(id__in=transactions).values(
+                'id', 'transaction', 'created_at_time', 'xch_price', 'confirmed_block_index',
+            )
+        }
+        rows = defaultdict(dict)
+        for row in PayoutAddress.objects.filter(lookup).values(
+            'transaction_id', 'launcher_id',
+        ).annotate(amount=Sum('amount')).order_by():
+            tx = details.get(row['transaction_id'], {})
+            rows[row['transaction_id']][row['launcher_id']] = (
+                row['amount'],
+                tx.get('transaction'),
+                tx.get('created_at_time'),
+                tx.get('xch_price'),
+                tx.get('confirmed_block_index'),
+            )
+
+        existing = defaultdict(dict)
+        for row in PayoutTransactionSummary.objects.filter(lookup).values_list(
+            'transaction_id', 'launcher_id', 'amount', 'transaction_name', 'created_at_time',
+            'xch_price', 'confirmed_block_index',
+        ):
+            existing[row[0]][row[1]] = row[2:]
+
+        # Only the transactions that changed are rewritten, so the ids of the
+        # summary only grow when something changed.
+        changed = [i for i in set(rows) | set(existing) if rows.get(i) != existing.get(i)]
+        if changed:
+            delete = Q(transaction_id__in=[i for i in changed if i is not None])
+            if None in changed:
+                delete |= Q(transaction_id__isnull=True)
+            PayoutTransactionSummary.objects.filter(delete).delete()
+            PayoutTransactionSummary.objects.bulk_create([
+                PayoutTransactionSummary(
+                    transaction_id=transaction_id,
+                    launcher_id=launcher_id,
+                    amount=amount,
+                    transaction_name=transaction_name,
+                    created_at_time=created_at_time,
+                    xch_price=xch_price,
+                    confirmed_block_index=confirmed_block_index,
+                )
+                for transaction_id in changed
+                for launcher_id, (
+                    amount, transaction_name, created_at_time, xch_price, confirmed_block_index,
+                ) in rows.get(transaction_id, {}).items()
+            ], batch_size=1000)
+
+        watermark.value = last_id
+        watermark.save()
+        tx_watermark.value = last_tx_id
+        tx_watermark.save()
+
+
+def partial_counters():
+    return {
+        'successful': Count('id', filter=Q(error=None)),
+        'failed': Count('id', filter=Q(error__isnull=False)),
+        'points': Sum('difficulty'),
+        'harvesters': ArrayAgg(
+            'harvester_id', distinct=True, filter=Q(harvester_id__isnull=False), default=[],
+        ),
+    }
+
+
+def union(a, b):
+    return sorted(set(a) | set(b))
+
+
+def get_partial_rollup_end():
+    """
+    Last partial id that can be rolled up, the newest one received over
+    `PARTIAL_ROLLUP_LAG` seconds ago.
+    """
+    cutoff = int(time.time()) - PARTIAL_ROLLUP_LAG
+    # The partitions of the last hour are enough unless partials stopped
+    last_id = Partial.objects.filter(
+        timestamp__gte=cutoff - 3600, timestamp__lt=cutoff,
+    ).aggregate(id=Max('id'))['id']
+    if last_id is None:
+        last_id = Partial.objects.filter(timestamp__lt=cutoff).aggregate(id=Max('id'))['id']
+    return last_id
+
+
+def rollup_partials(name, rollup):
+    """
+    Call `rollup` with the partials received since the last run under the
+    `name` watermark, in at most `PARTIAL_MAX_BATCHES` batches of
+    `PARTIAL_BATCH_SIZE` ids, up to the partials received
+    `PARTIAL_ROLLUP_LAG` seconds ago. Returns whether it caught up.
+    """
+    last_id = get_partial_rollup_end()
+    if last_id is None:
+        return True
+
+    for _ in range(PARTIAL_MAX_BATCHES):
+        with transaction.atomic():
+            watermark = get_watermark(name, for_update=True)
+            if watermark.value >= last_id:
+                return True
+            batch_end = min(last_id, watermark.value + PARTIAL_BATCH_SIZE)
+
+            rollup(Partial.objects.filter(id__gt=watermark.value, id__lte=batch_end))
+
+            watermark.value = batch_end
+            watermark.save()
+    return get_watermark_value(name) >= last_id
+
+
+def update_launcher_partial_hour():
+    """
+    Add the partials received since the last run to the per launcher hourly
+    counters.
+    """
+    def rollup(partials):
+        rows = partials.annotate(
+            hour=F('timestamp') - Mod('timestamp', 3600),
+        ).values('launcher_id', 'hour').annotate(**partial_counters()).order_by()
+        merge_counters(
+            LauncherPartialHour,
+            ('launcher_id', 'hour'),
+            list(rows),
+            ('successful', 'failed', 'points', 'harvesters'),
+            combine={'harvesters': union},
+        )
+
+    return rollup_partials('launcher_partial_hour', rollup)
+
+
+def harvester_counters():
+    return {
+        'successful': Count('id', filter=Q(error=None)),
+        'failed': Count('id', filter=Q(error__isnull=False)),
+        'points': Sum('difficulty'),
+        'last_seen': Max('timestamp'),
+    }
+
+
+def update_harvester_partial_day():
+    """
+    Add the partials received since the last run to the per harvester daily
+    counters.
+    """
+    def rollup(partials):
+        rows = partials.filter(harvester_id__isnull=False).annotate(
+            date=PARTIAL_DATE,
+        ).values('launcher_id', 'date', 'harvester_id').annotate(**harvester_counters()).order_by()
+        merge_counters(
+            HarvesterPartialDay,
+            ('launcher_id', 'date', 'harvester_id'),
+            list(rows),
+            ('successful', 'failed', 'points', 'last_seen'),
+            combine={'last_seen': max},
+        )
+
+    return rollup_partials('harvester_partial_day', rollup)
+
+
+def get_launcher_harvesters(launcher, since):
+    """
+    Partial counters per harvester of `launcher` from the day of `since`,
+    read from the daily counters plus the partials not rolled up yet.
+    """
+    date = datetime.datetime.fromtimestamp(since, datetime.timezone.utc).date()
+    start, _ = day_range(date)
+    days = HarvesterPartialDay.objects.filter(launcher=launcher, date__gte=date).values(
+        'harvester_id',
+    ).annotate(
+        successful=Sum('successful'),
+        failed=Sum('failed'),
+        points=Sum('points'),
+        last_seen=Max('last_seen'),
+    ).order_by()
+    tail = Partial.objects.filter(
+        launcher=launcher,
+        harvester_id__isnull=False,
+        id__gt=get_watermark_value('harvester_partial_day'),
+        timestamp__gte=start,
+    ).values('harvester_id').annotate(**harvester_counters()).order_by()
+
+    harvesters = {}
+    for row in list(days) + list(tail):
+        harvester = harvesters.setdefault(row['harvester_id'], {
+            'harvester_id': row['harvester_id'], 'successful': 0, 'failed': 0, 'points': 0, 'last_seen': 0,
+        })
+        harvester['successful'] += row['successful']
+        harvester['failed'] += row['failed']
+        harvester['points'] += row['points'] or 0
+        harvester['last_seen'] = max(harvester['last_seen'], row['last_seen'])
+    return sorted(harvesters.values(), key=lambda i: i['last_seen'], reverse=True)
+
+
+def dimension_counters():
+    return {
+        'partials': Count('id'),
+        'failed': Count('id', filter=Q(error__isnull=False)),
+        'points': Sum('difficulty'),
+    }
+
+
+def dimension_rows(partials, keys):
+    """
+    Counters of `partials` grouped by `keys` and the value of each of the
+    `PARTIAL_DIMENSIONS`.
+    """
+    rows = []
+    for dimension in PARTIAL_DIMENSIONS:
+        rows.extend(
+            dict(row, dimension=dimension) for row in partials.values(
+                *keys, value=Coalesce(dimension, Value('')),
+            ).annotate(**dimension_counters()).order_by()
+        )
+    return rows
+
+
+def update_partial_dimension_hour():
+    """
+    Add the partials received since the last run to the pool wide hourly
+    counters per dimension value.
+    """
+    def rollup(partials):
+        rows = dimension_rows(partials.annotate(hour=F('timestamp') - Mod('timestamp', 3600)), ('hour',))
+        merge_counters(
+            PartialDimensionHour, ('dimension', 'hour', 'value'), rows, ('partials', 'failed', 'points'),
+        )
+
+    return rollup_partials('partial_dimension_hour', rollup)
+
+
+def update_launcher_partial_dimension_day():
+    """
+    Add the partials received since the last run to the per launcher daily
+    counters per dimension value.
+    """
+    def rollup(partials):
+        rows = dimension_rows(partials.annotate(date=PARTIAL_DATE), ('launcher_id', 'date'))
+        merge_counters(
+            LauncherPartialDimensionDay,
+            ('launcher_id', 'dimension', 'date', 'value'),
+            rows,
+            ('partials', 'failed', 'points'),
+        )
+
+    return rollup_partials('launcher_partial_dimension_day', rollup)
+
+
+def get_partial_dimension(dimension, since, launcher=None):
+    """
+    Partial counters per value of `dimension` since `since`, pool wide from
+    its hour or for `launcher` from its day, read from the counters plus the
+    partials not rolled up yet.
+    """
+    if launcher is None:
+        start = since - since % 3600
+        name = 'partial_dimension_hour'
+        rolled_up = PartialDimensionHour.objects.filter(dimension=dimension, hour__gte=start)
+        tail = Partial.objects.all()
+    else:
+        date = datetime.datetime.fromtimestamp(since, datetime.timezone.utc).date()
+        start, _ = day_range(date)
+        name = 'launcher_partial_dimension_day'
+        rolled_up = LauncherPartialDimensionDay.objects.filter(
+            launcher=launcher, dimension=dimension, date__gte=date,
+        )
+        tail = Partial.objects.filter(launcher=launcher)
+
+    rolled_up = rolled_up.values('value').annotate(
+        partials=Sum('partials'), failed=Sum('failed'), points=Sum('points'),
+    ).order_by()
+    tail = tail.filter(id__gt=get_watermark_value(name), timestamp__gte=start).values(
+        value=Coalesce(dimension, Value('')),
+    ).annotate(**dimension_counters()).order_by()
+
+    values = {}
+    for row in list(rolled_up) + list(tail):
+        value = values.setdefault(row['value'], {'value': row['value'], 'partials': 0, 'failed': 0, 'points': 0})
+        value['partials'] += row['partials']
+        value['failed'] += row['failed']
+        value['points'] += row['points'] or 0
+    return sorted(values.values(), key=lambda i: i['partials'], reverse=True)
+
+
+# Rollups fed from the partial table by watermark name, partials can only
+# be removed once all of them went past them.
+PARTIAL_ROLLUPS = {
+    'launcher_partial_hour': update_launcher_partial_hour,
+    'harvester_partial_day': update_harvester_partial_day,
+    'partial_dimension_hour': update_partial_dimension_hour,
+    'launcher_partial_dimension_day': update_launcher_partial_dimension_day,
+}
+
+
+def get_launcher_partial_hours(launcher, since):
+    """
+    Hourly partial counters of `launcher` from the hour of `since`, read from
+    the hourly counters plus the partials not rolled up yet.
+    """
+    start = since - since % 3600
+    hours = defaultdict(lambda: {'points': 0, 'successful': 0, 'failed': 0})
+    rolled_up = LauncherPartialHour.objects.filter(launcher=launcher, hour__gte=start).values(
+        'hour', 'successful', 'failed', 'points',
+    )
+    tail = Partial.objects.filter(
+        launcher=launcher,
+        id__gt=get_watermark_value('launcher_partial_hour'),
+        timestamp__gte=start,
+    ).annotate(
+        hour=F('timestamp') - Mod('timestamp', 3600),
+    ).values('hour').annotate(**partial_counters()).order_by()
+    for row in list(rolled_up) + list(tail):
+        hour = hours[row['hour']]
+        hour['points'] += row['points'] or 0
+        hour['successful'] += row['successful']
+        hour['failed'] += row['failed']
+    return hours
+
+
+def get_launcher_partials(launcher, since):
+    """
+    Partial counters of `launcher` since `since` exactly, read from the
+    hourly counters of the full hours plus the partials of the leading
+    partial hour and the ones not rolled up yet.
+    """
+    start = since + (-since % 3600)
+    totals = {'successful': 0, 'failed': 0, 'points': 0, 'harvesters': []}
+    hours = LauncherPartialHour.objects.filter(launcher=launcher, hour__gte=start).values(
+        'successful', 'failed', 'points', 'harvesters',
+    )
+    tail = Partial.objects.filter(
+        Q(id__gt=get_watermark_value('launcher_partial_hour')) | Q(timestamp__lt=start),
+        launcher=launcher,
+        timestamp__gte=since,
+    ).aggregate(**partial_counters())
+    for row in list(hours) + [tail]:
+        totals['successful'] += row['successful']
+        totals['failed'] += row['failed']
+        totals['points'] += row['points'] or 0
+        totals['harvesters'] = union(totals['harvesters'], row['harvesters'])
+    return totals
+
+
+def update_leaderboard():
+    """
+    Rebuild the pool members ranking by PPLNS points, at most once every
+    `LEADERBOARD_INTERVAL` seconds.
+    """
+    with transaction.atomic():
+        watermark = get_watermark('leaderboard', for_update=True)
+        now = int(time.time())
+        if now - watermark.value < LEADERBOARD_INTERVAL:
+            return
+
+        launchers = Launcher.objects.filter(is_pool_member=True).annotate(
+            rank=Window(RowNumber(), order_by=[F('points_pplns').desc(), F('launcher_id')]),
+        ).values_list('launcher_id', 'rank', 'name', 'points_pplns', 'share_pplns', 'estimated_size')
+        Leaderboard.objects.all().delete()
+        Leaderboard.objects.bulk_create([
+            Leaderboard(
+                launcher_id=launcher_id,
+                rank=rank,
+                name=name,
+                points_pplns=points_pplns,
+                share_pplns=share_pplns,
+                estimated_size=estimated_size,
+            ) for launcher_id, rank, name, points_pplns, share_pplns, estimated_size in launchers
+        ], batch_size=1000)
+
+        watermark.value = now
+        watermark.save()
+
+
+def effort_stats(effort):
+    counts = np.bincount(
+        np.searchsorted(EFFORT_BINS, effort, side='right'), minlength=len(EFFORT_BINS) + 1,
+    )
+    if not effort.size:
+        return {'blocks': 0, 'average': None, 'percentiles': None, 'histogram': counts.tolist()}
+    p10, p25, p50, p75, p90 = np.percentile(effort, [10, 25, 50, 75, 90])
+    return {
+        'blocks': int(effort.size),
+        'average': float(effort.mean()),
+        'percentiles': {
+            '10': float(p10),
+            '25': float(p25),
+            '50': float(p50),
+            '75': float(p75),
+            '90': float(p90),
+        },
+        'min': int(effort.min()),
+        'max': int(effort.max()),
+        'histogram': counts.tolist(),
+    }
+
+
+def update_block_effort():
+    """
+    Add the blocks found since the last run to the per launcher effort and
+    recompute the pool effort windows, which are also refreshed every
+    `EFFORT_MAX_AGE` seconds as they slide.
+    """
+    with transaction.atomic():
+        watermark = get_watermark('block_effort', for_update=True)
+        stats = BlockEffortStats.load()
+        new_blocks = list(Block.objects.filter(id__gt=watermark.value).order_by('id').values_list(
+            'id', 'farmed_by_id', 'launcher_effort', 'timestamp',
+        ))
+        if not new_blocks and stats.updated_at is not None and (
+            (timezone.now() - stats.updated_at).total_seconds() < EFFORT_MAX_AGE
+        ):
+            return
+
+        rows = {}
+        for _, launcher_id, effort, timestamp in new_blocks:
+            if launcher_id is None or effort < 0:
+                continue
+            row = rows.setdefault(launcher_id, {
+                'launcher_id': launcher_id, 'blocks': 0, 'effort_sum': 0, 'best_effort': effort,
+            })
+            row['blocks'] += 1
+            row['effort_sum'] += effort
+            row['best_effort'] = min(row['best_effort'], effort)
+            row['last_effort'] = effort
+            row['last_timestamp'] = timestamp
+        merge_counters(
+            LauncherEffort,
+            ('launcher_id',),
+            list(rows.values()),
+            ('blocks', 'effort_sum', 'best_effort', 'last_effort', 'last_timestamp'),
+            combine={
+                'best_effort': min,
+                'last_effort': lambda a, b: b,
+                'last_timestamp': lambda a, b: b,
+            },
+        )
+
+        now = int(time.time())
+        day = 60 * 60 * 24
+        blocks = np.array(Block.objects.filter(
+            timestamp__gte=now - max(EFFORT_WINDOWS) * day,
+        ).exclude(luck=-1).values_list('timestamp', 'luck'), dtype=np.int64).reshape(-1, 2)
+        timestamps, effort = blocks[:, 0], blocks[:, 1]
+        stats.bins = EFFORT_BINS
+        stats.windows = {
+            str(days): effort_stats(effort[timestamps >= now - days * day]) for days in EFFORT_WINDOWS
+        }
+        stats.updated_at = timezone.now()
+        stats.save()
+
+        if new_blocks:
+            watermark.value = new_blocks[-1][0]
+            watermark.save()
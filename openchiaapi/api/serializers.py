@@ -1,19 +1,39 @@
 import time
-from datetime import timedelta
+from collections import defaultdict
+from datetime import datetime, timedelta
 
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Count, Sum
-from django.db.models.functions import Trunc
+from django.db.models import Count, Prefetch, Q, Sum
 from django.utils import timezone
 from rest_framework import serializers
 
 from pool.util import calculate_effort, days_pooling, stay_fee_discount, size_discount
-
-from .models import Block, Launcher, Partial, Payout, PayoutAddress, Transaction
+from referral.models import Referral
+
+from .models import (
+    Block,
+    Launcher,
+    LauncherDailyRewards,
+    LauncherEffort,
+    Leaderboard,
+    Partial,
+    Payout,
+    PayoutAddress,
+    Transaction,
+)
+from .rollups import get_launcher_partials, get_watermark_value
 from .utils import get_pool_fees
 
 
 POOL_FEES = get_pool_fees()
+NOTIFICATION_FIELDS = (
+    'size_drop',
+    'size_drop_interval',
+    'size_drop_percent',
+    'failed_partials',
+    'failed_partials_percent',
+    'payment',
+)
 
 
 class LauncherSerializer(serializers.HyperlinkedModelSerializer):
@@ -21,7 +41,9 @@ class LauncherSerializer(serializers.HyperlinkedModelSerializer):
     payout = serializers.SerializerMethodField('get_payout')
     fee = serializers.SerializerMethodField('get_fee')
     blocks = serializers.SerializerMethodField('get_blocks')
-    partials = serializers.SerializerMethodField('get_partials')
+    partials = serializers.SerializerMethodField(
+        'get_partials', help_text='Partials of the last 24 hours, counted exactly from now',
+    )
     rewards = serializers.SerializerMethodField('get_rewards')
 
     class Meta:
@@ -46,6 +68,32 @@ class LauncherSerializer(serializers.HyperlinkedModelSerializer):
             'rewards',
         ]
 
+    def __init__(self, *args, fields=None, omit=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Sparse fieldsets, fields left out never run their queries
+        self.selected = set(fields) if fields else None
+        self.omitted = set(omit or ())
+        for name in list(self.fields):
+            if not self.is_selected(name):
+                self.fields.pop(name)
+
+    @staticmethod
+    def setup_eager_loading(queryset, prefix=''):
+        """
+        Load the owner only data along with the launchers, `prefix` being the
+        lookup path to the launcher from the queryset model.
+        """
+        return queryset.select_related(f'{prefix}notification').prefetch_related(Prefetch(
+            f'{prefix}referral_set',
+            queryset=Referral.objects.filter(active=True),
+            to_attr='active_referrals',
+        ))
+
+    def is_selected(self, name):
+        if name in self.omitted:
+            return False
+        return self.selected is None or name in self.selected
+
     def get_points_of_total(self, instance):
         return float(instance.share_pplns)
 
@@ -69,18 +117,16 @@ class LauncherSerializer(serializers.HyperlinkedModelSerializer):
     def get_payout(self, instance):
         if 'view' not in self.context or self.context['view'].get_view_name() != 'Launcher Instance':
             return {}
+        paid = Q(transaction__confirmed_block_index__isnull=False)
+        totals = instance.payoutaddress_set.aggregate(
+            total_paid=Sum('amount', filter=paid),
+            total_unpaid=Sum('amount', filter=~paid),
+            total_transactions=Count('transaction__transaction', filter=paid, distinct=True),
+        )
         return {
-            'total_paid': instance.payoutaddress_set.exclude(
-                transaction__confirmed_block_index=None
-            ).aggregate(total_paid=Sum('amount'))['total_paid'] or 0,
-            'total_unpaid': instance.payoutaddress_set.filter(
-                transaction__confirmed_block_index=None
-            ).aggregate(total_unpaid=Sum('amount'))['total_unpaid'] or 0,
-            'total_transactions': instance.payoutaddress_set.exclude(
-                transaction__confirmed_block_index=None
-            ).values('transaction__transaction').order_by('transaction__transaction').aggregate(
-                transactions=Count('transaction__transaction', distinct=True)
-            )['transactions']
+            'total_paid': totals['total_paid'] or 0,
+            'total_unpaid': totals['total_unpaid'] or 0,
+            'total_transactions': totals['total_transactions'],
         }
 
     def get_blocks(self, instance):
@@ -93,61 +139,62 @@ class LauncherSerializer(serializers.HyperlinkedModelSerializer):
     def get_partials(self, instance):
         if 'view' not in self.context or self.context['view'].get_view_name() != 'Launcher Instance':
             return {}
-        last_day = instance.partial_set.filter(timestamp__gte=int(time.time()) - 60 * 60 * 24)
-        total = last_day.count()
-        successful = last_day.filter(error=None).count()
-        failed = last_day.exclude(error=None).count()
+        last_day = get_launcher_partials(instance, int(time.time()) - 60 * 60 * 24)
+        successful = last_day['successful']
+        total = successful + last_day['failed']
         return {
             'total': total,
-            'points': last_day.aggregate(points=Sum('difficulty'))['points'] or 0,
+            'points': last_day['points'],
             'successful': successful,
-            'failed': failed,
+            'failed': last_day['failed'],
             'performance': (successful / total) * 100 if total else None,
-            'harvesters': last_day.aggregate(num=Count('harvester_id', distinct=True))['num'],
+            'harvesters': len(last_day['harvesters']),
         }
 
     def get_rewards(self, instance):
         if 'view' not in self.context or self.context['view'].get_view_name() != 'Launcher Instance':
             return {}
+        now = timezone.now()
+        today = now.date()
         pa = PayoutAddress.objects.filter(launcher=instance)
-        today = pa.filter(
-            payout__datetime__date=timezone.now().date()
-        ).aggregate(total=Sum('amount'))['total']
 
-        yesterday = pa.filter(
-            payout__datetime__date=timezone.now().date() - timedelta(days=1)
-        ).aggregate(total=Sum('amount'))['total']
+        # Rolled up days plus the payouts that were not rolled up yet
+        per_day = defaultdict(int)
+        for date, amount in LauncherDailyRewards.objects.filter(
+            launcher=instance, date__gte=today - timedelta(days=30),
+        ).values_list('date', 'amount'):
+            per_day[date] += amount
+        for payout_datetime, amount in pa.filter(
+            id__gt=get_watermark_value('launcher_daily_rewards'),
+            payout__datetime__date__gte=today - timedelta(days=30),
+        ).values_list('payout__datetime', 'amount'):
+            per_day[payout_datetime.date()] += amount
+
+        def total(since):
+            days = [amount for date, amount in per_day.items() if date >= since]
+            return sum(days) if days else None
 
         last_24h = pa.filter(
-            payout__datetime__gte=timezone.now() - timedelta(hours=24)
-        ).aggregate(total=Sum('amount'))['total']
-
-        last_7d = pa.filter(
-            payout__datetime__date__gte=timezone.now().date() - timedelta(days=7)
+            payout__datetime__gte=now - timedelta(hours=24)
         ).aggregate(total=Sum('amount'))['total']
 
-        last_30d = pa.filter(
-            payout__datetime__date__gte=timezone.now().date() - timedelta(days=30)
-        ).aggregate(total=Sum('amount'))['total']
-
-        last_per_day = pa.filter(
-            payout__datetime__date__gte=timezone.now().date() - timedelta(days=7)
-        ).annotate(day=Trunc('payout__datetime', 'day')).values('day').annotate(amount=Sum('amount')).order_by('day')
-
         return {
-            'today': today,
-            'yesterday': yesterday,
+            'today': per_day.get(today),
+            'yesterday': per_day.get(today - timedelta(days=1)),
             'last_24h': last_24h,
-            'last_7d': last_7d,
-            'last_30d': last_30d,
-            'last_per_day': last_per_day,
+            'last_7d': total(today - timedelta(days=7)),
+            'last_30d': total(today - timedelta(days=30)),
+            'last_per_day': [{
+                'day': timezone.make_aware(datetime.combine(date, datetime.min.time())),
+                'amount': per_day[date],
+            } for date in sorted(per_day) if date >= today - timedelta(days=7)],
         }
 
     def to_representation(self, instance):
         ret = super().to_representation(instance)
         if (self.context['request'].auth and
-                self.context['request'].auth.launcher_id == ret['launcher_id']) or \
-                self.context['request'].session.get('launcher_id') == ret['launcher_id']:
+                self.context['request'].auth.launcher_id == instance.launcher_id) or \
+                self.context['request'].session.get('launcher_id') == instance.launcher_id:
             ret['email'] = instance.email
             ret['notify_missing_partials_hours'] = instance.notify_missing_partials_hours
             ret['push_missing_partials_hours'] = instance.push_missing_partials_hours
@@ -156,25 +203,24 @@ class LauncherSerializer(serializers.HyperlinkedModelSerializer):
             ret['custom_difficulty'] = instance.custom_difficulty
             ret['minimum_payout'] = instance.minimum_payout
             ret['payout_instructions'] = instance.payout_instructions
-            try:
-                notification = instance.notification
-                ret['size_drop'] = notification.size_drop
-                ret['size_drop_interval'] = notification.size_drop_interval
-                ret['size_drop_percent'] = notification.size_drop_percent
-                ret['failed_partials'] = notification.failed_partials
-                ret['failed_partials_percent'] = notification.failed_partials_percent
-                ret['payment'] = notification.payment
-            except ObjectDoesNotExist:
-                ret['size_drop'] = []
-                ret['size_drop_interval'] = None
-                ret['size_drop_percent'] = None
-                ret['failed_partials'] = None
-                ret['failed_partials_percent'] = None
-                ret['payment'] = []
-            try:
-                ret['referrer'] = instance.referral_set.filter(active=True)[0].referrer_id
-            except IndexError:
-                ret['referrer'] = None
+            if any(self.is_selected(i) for i in NOTIFICATION_FIELDS):
+                try:
+                    notification = instance.notification
+                    for i in NOTIFICATION_FIELDS:
+                        ret[i] = getattr(notification, i)
+                except ObjectDoesNotExist:
+                    ret['size_drop'] = []
+                    ret['size_drop_interval'] = None
+                    ret['size_drop_percent'] = None
+                    ret['failed_partials'] = None
+                    ret['failed_partials_percent'] = None
+                    ret['payment'] = []
+            if self.is_selected('referrer'):
+                if hasattr(instance, 'active_referrals'):
+                    referrals = instance.active_referrals
+                else:
+                    referrals = instance.referral_set.filter(active=True)[:1]
+                ret['referrer'] = referrals[0].referrer_id if referrals else None
 
         if 'view' in self.context and self.context['view'].get_view_name() == 'Launcher Instance':
             ret['current_etw'] = instance.current_etw
@@ -187,9 +233,37 @@ class LauncherSerializer(serializers.HyperlinkedModelSerializer):
                 )
             else:
                 ret['current_effort'] = None
+
+        if self.selected is not None or self.omitted:
+            ret = {k: v for k, v in ret.items() if self.is_selected(k)}
         return ret
 
 
+class LauncherMinimalSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = Launcher
+        fields = [
+            'launcher_id',
+            'name',
+        ]
+
+
+class LeaderboardSerializer(serializers.ModelSerializer):
+    launcher_id = serializers.CharField()
+
+    class Meta:
+        model = Leaderboard
+        fields = [
+            'rank',
+            'launcher_id',
+            'name',
+            'points_pplns',
+            'share_pplns',
+            'estimated_size',
+        ]
+
+
 class LauncherUpdateSerializer(serializers.Serializer):
     name = serializers.CharField(required=False)
     email = serializers.EmailField(required=False, allow_null=True)
@@ -232,13 +306,17 @@ class LauncherUpdateSerializer(serializers.Serializer):
 
 
 class BlockSerializer(serializers.HyperlinkedModelSerializer):
-    farmed_by = LauncherSerializer()
+    farmed_by = LauncherMinimalSerializer()
 
     class Meta:
         model = Block
         fields = '__all__'
 
 
+class BlockExpandedSerializer(BlockSerializer):
+    farmed_by = LauncherSerializer()
+
+
 class BlockMinimalSerializer(serializers.HyperlinkedModelSerializer):
 
     class Meta:
@@ -283,7 +361,7 @@ class TransactionSerializer(serializers.HyperlinkedModelSerializer):
 
 
 class PayoutAddressSerializer(serializers.HyperlinkedModelSerializer):
-    launcher = LauncherSerializer()
+    launcher = LauncherMinimalSerializer()
     payout = PayoutSerializer()
     transaction = TransactionSerializer()
 
@@ -294,6 +372,15 @@ class PayoutAddressSerializer(serializers.HyperlinkedModelSerializer):
         )
 
 
+class PayoutAddressFlatSerializer(serializers.ModelSerializer):
+
+    class Meta:
+        model = PayoutAddress
+        fields = (
+            'id', 'payout', 'puzzle_hash', 'launcher', 'amount', 'transaction',
+        )
+
+
 class PayoutTransactionSerializer(serializers.Serializer):
     transaction_name = serializers.CharField()
     created_at_time = serializers.CharField()
@@ -326,6 +413,37 @@ class StatsSerializer(serializers.Serializer):
     xch_tb_month = serializers.DecimalField(max_digits=10, decimal_places=9)
 
 
+class ProfitabilitySerializer(serializers.Serializer):
+    date = serializers.DateField()
+    blocks = serializers.IntegerField()
+    xch_tb = serializers.FloatField()
+    xch_tb_month = serializers.FloatField()
+
+
+class LauncherEffortSerializer(serializers.ModelSerializer):
+    average_effort = serializers.SerializerMethodField()
+
+    class Meta:
+        model = LauncherEffort
+        fields = [
+            'blocks',
+            'average_effort',
+            'best_effort',
+            'last_effort',
+            'last_timestamp',
+        ]
+
+    def get_average_effort(self, instance):
+        return instance.effort_sum / instance.blocks
+
+
+class EffortSerializer(serializers.Serializer):
+    updated_at = serializers.DateTimeField()
+    bins = serializers.ListField(child=serializers.IntegerField())
+    windows = serializers.DictField()
+    launcher = LauncherEffortSerializer(required=False)
+
+
 class SpaceSerializer(serializers.Serializer):
     date = serializers.DateTimeField()
     size = serializers.IntegerField()
@@ -344,3 +462,35 @@ class TimeseriesSerializer(serializers.Serializer):
     datetime = serializers.CharField(required=True)
     field = serializers.IntegerField(required=True)
     value = serializers.IntegerField(required=True)
+
+
+class PartialTimeseriesSerializer(serializers.Serializer):
+    datetime = serializers.DateTimeField()
+    harvester = serializers.CharField(allow_null=True)
+    points = serializers.IntegerField()
+    successful = serializers.IntegerField()
+    failed = serializers.IntegerField()
+
+
+class HarvesterSerializer(serializers.Serializer):
+    harvester_id = serializers.CharField()
+    successful = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    performance = serializers.SerializerMethodField()
+    points = serializers.IntegerField()
+    last_seen = serializers.IntegerField()
+
+    def get_performance(self, instance):
+        total = instance['successful'] + instance['failed']
+        return (instance['successful'] / total) * 100 if total else None
+
+
+class PartialDimensionSerializer(serializers.Serializer):
+    value = serializers.CharField(allow_blank=True)
+    partials = serializers.IntegerField()
+    failed = serializers.IntegerField()
+    performance = serializers.SerializerMethodField()
+    points = serializers.IntegerField()
+
+    def get_performance(self, instance):
+        return ((instance['partials'] - instance['failed']) / instance['partials']) * 100
@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import textwrap
+import time
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Avg, Count, Max, Q, Sum
+from django.utils import timezone
+
+from .models import Block, GlobalInfo, Launcher, Payout, PoolStatsSnapshot
+from .rollups import XCH_TB
+from .utils import estimated_time_to_win, get_influxdb_client, get_pool_info
+
+
+logger = logging.getLogger('api.stats')
+# Not the loop's default executor, asyncio.run() would wait on it for
+# queries that already missed the deadline.
+_EXECUTOR = ThreadPoolExecutor(max_workers=12, thread_name_prefix='stats')
+
+
+def get_pool_stats():
+    """
+    Snapshot used by the stats endpoints, built on the spot if the refresher
+    has not run yet.
+    """
+    snapshot = PoolStatsSnapshot.load()
+    if snapshot.updated_at is None:
+        snapshot = refresh_pool_stats()
+    return snapshot
+
+
+def get_influxdb_last(query_api, measurement, field):
+    q = query_api.query(
+        textwrap.dedent('''from(bucket: "openchia")
+          |> range(start: duration(v: "-60m"))
+          |> filter(fn: (r) => r["_measurement"] == _measurement)
+          |> filter(fn: (r) => r["_field"] == _field)
+          |> last()'''),
+        params={
+            '_measurement': measurement,
+            '_field': field,
+        },
+    )
+    return int(q[0].records[0]['_value'])
+
+
+def get_farmer_stats():
+    # Only reads points_pplns, the column of farmer_pool_member_idx, so it can
+    # be an index only scan (Count('*') does not take a filter).
+    return Launcher.objects.filter(is_pool_member=True).aggregate(
+        farmers=Count('*'),
+        farmers_active=Count('points_pplns', filter=Q(points_pplns__gt=0)),
+    )
+
+
+def get_block_stats():
+    block = Block.objects.order_by('-confirmed_block_index')
+    days30 = 30 * 24 * 60 * 60
+    profitability = block.filter(
+        timestamp__gte=time.time() - days30, pool_space__gt=0,
+    ).aggregate(total=Sum(XCH_TB))['total'] or 0
+    return {
+        'rewards_amount': block.aggregate(total=Sum('amount'))['total'] or 0,
+        'rewards_blocks': block.count(),
+        'last_rewards': [{
+            'timestamp': i.timestamp,
+            'height': i.confirmed_block_index,
+        } for i in block[:10]],
+        'average_effort': block.filter(
+            ~Q(luck=-1), timestamp__gte=time.time() - days30
+        ).aggregate(total=Avg('luck'))['total'],
+        'xch_tb_month': profitability / 30,
+    }
+
+
+def get_globalinfo_stats():
+    globalinfo = GlobalInfo.load()
+    return {
+        'blockchain_height': globalinfo.blockchain_height,
+        'blockchain_space': globalinfo.blockchain_space,
+        'blockchain_avg_block_time': globalinfo.blockchain_avg_block_time,
+        'xch_current_price': globalinfo.xch_current_price,
+        'pool_wallets': globalinfo.wallets,
+    }
+
+
+def _run_closing_connections(func, *args):
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
+
+
+async def gather_pool_stats(timeout):
+    """
+    Run the InfluxDB queries, the pool info request and the database
+    aggregates concurrently. Whatever did not finish within `timeout` seconds
+    or failed is left out of the result.
+    """
+    loop = asyncio.get_running_loop()
+    query_api = get_influxdb_client().query_api()
+    tasks = {
+        name: loop.run_in_executor(_EXECUTOR, _run_closing_connections, func, *args)
+        for name, func, args in (
+            ('pool_size', get_influxdb_last, (query_api, 'pool_size', 'global')),
+            ('mempool', get_influxdb_last, (query_api, 'mempool', 'full_pct')),
+            ('pool_info', get_pool_info, ()),
+            ('farmers', get_farmer_stats, ()),
+            ('blocks', get_block_stats, ()),
+            ('globalinfo', get_globalinfo_stats, ()),
+        )
+    }
+    await asyncio.wait(tasks.values(), timeout=timeout)
+
+    results = {}
+    for name, task in tasks.items():
+        if not task.done():
+            task.cancel()
+            logger.error('Timed out getting %s', name)
+        elif task.exception():
+            logger.error('Failed to get %s', name, exc_info=task.exception())
+        else:
+            results[name] = task.result()
+    return results
+
+
+def refresh_pool_stats(max_age=None):
+    """
+    Rebuild the pool stats snapshot.
+
+    When `max_age` is given the snapshot is only rebuilt if a block or payout
+    landed since the last build or it is older than `max_age` seconds.
+    Values that could not be fetched in time keep their last known value.
+    """
+    snapshot = PoolStatsSnapshot.load()
+    last_block_id = Block.objects.aggregate(id=Max('id'))['id']
+    last_payout_id = Payout.objects.aggregate(id=Max('id'))['id']
+
+    if max_age is not None and snapshot.updated_at is not None and (
+        snapshot.last_block_id == last_block_id and
+        snapshot.last_payout_id == last_payout_id and
+        (timezone.now() - snapshot.updated_at).total_seconds() < max_age
+    ):
+        return snapshot
+
+    results = asyncio.run(gather_pool_stats(settings.STATS_DEADLINE))
+
+    if 'pool_info' in results:
+        snapshot.fee = Decimal(results['pool_info']['fee'])
+    if 'pool_size' in results:
+        snapshot.pool_space = results['pool_size']
+    if 'mempool' in results:
+        snapshot.blockchain_mempool_full_pct = results['mempool']
+    for name in ('farmers', 'blocks'):
+        for k, v in results.get(name, {}).items():
+            setattr(snapshot, k, v)
+
+    if 'globalinfo' in results:
+        globalinfo = results['globalinfo']
+        snapshot.blockchain_height = globalinfo['blockchain_height']
+        snapshot.blockchain_space = globalinfo['blockchain_space']
+        snapshot.xch_current_price = globalinfo['xch_current_price']
+        snapshot.pool_wallets = globalinfo['pool_wallets']
+        snapshot.estimate_win = estimated_time_to_win(
+            snapshot.pool_space, int(globalinfo['blockchain_space']), globalinfo['blockchain_avg_block_time'],
+        )
+
+    # Only move the markers forward once the block and payout dependent
+    # values were actually refreshed, so a miss is retried right away.
+    if 'blocks' in results:
+        snapshot.last_block_id = last_block_id
+        snapshot.last_payout_id = last_payout_id
+    snapshot.updated_at = timezone.now()
+    snapshot.save()
+    return snapshot
@@ -0,0 +1,330 @@
+import datetime
+import tempfile
+import time
+from unittest import mock
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase, override_settings
+from influxdb_client.client.flux_table import FluxColumn, FluxRecord, FluxTable
+from django.utils import timezone
+
+from . import archive, rollups
+from .models import (
+    Launcher,
+    LauncherDailyRewards,
+    LauncherEffort,
+    Partial,
+    Payout,
+    PayoutAddress,
+    PayoutTransactionSummary,
+    Transaction,
+)
+
+
+def create_launcher(launcher_id):
+    return Launcher.objects.create(
+        launcher_id=launcher_id,
+        delay_time=0,
+        singleton_tip=b'',
+        singleton_tip_state=b'',
+        p2_singleton_puzzle_hash='',
+        points=0,
+        points_pplns=0,
+        share_pplns=0,
+        difficulty=1,
+        is_pool_member=True,
+    )
+
+
+class MergeCountersTest(TestCase):
+
+    def setUp(self):
+        self.launchers = [create_launcher(f'{i:064x}') for i in range(2)]
+        self.date = datetime.date(2024, 1, 1)
+
+    def test_adds_up_existing_and_creates_new(self):
+        a, b = self.launchers
+        rollups.merge_counters(LauncherDailyRewards, ('launcher_id', 'date'), [
+            {'launcher_id': a.launcher_id, 'date': self.date, 'amount': 10},
+        ], ('amount',))
+        rollups.merge_counters(LauncherDailyRewards, ('launcher_id', 'date'), [
+            {'launcher_id': a.launcher_id, 'date': self.date, 'amount': 5},
+            {'launcher_id': b.launcher_id, 'date': self.date, 'amount': 7},
+            {'launcher_id': a.launcher_id, 'date': self.date + datetime.timedelta(days=1), 'amount': 1},
+        ], ('amount',))
+
+        self.assertEqual(
+            set(LauncherDailyRewards.objects.values_list('launcher_id', 'date', 'amount')),
+            {
+                (a.launcher_id, self.date, 15),
+                (b.launcher_id, self.date, 7),
+                (a.launcher_id, self.date + datetime.timedelta(days=1), 1),
+            },
+        )
+
+    def test_combine(self):
+        a, _ = self.launchers
+        fields = ('blocks', 'effort_sum', 'best_effort', 'last_effort', 'last_timestamp')
+        combine = {'best_effort': min, 'last_effort': lambda x, y: y, 'last_timestamp': lambda x, y: y}
+        for effort, timestamp in ((80, 1), (120, 2)):
+            rollups.merge_counters(LauncherEffort, ('launcher_id',), [{
+                'launcher_id': a.launcher_id,
+                'blocks': 1,
+                'effort_sum': effort,
+                'best_effort': effort,
+                'last_effort': effort,
+                'last_timestamp': timestamp,
+            }], fields, combine=combine)
+
+        effort = LauncherEffort.objects.get(launcher=a)
+        self.assertEqual(
+            (effort.blocks, effort.effort_sum, effort.best_effort, effort.last_effort, effort.last_timestamp),
+            (2, 200, 80, 120, 2),
+        )
+
+    def test_no_rows(self):
+        rollups.merge_counters(LauncherDailyRewards, ('launcher_id', 'date'), [], ('amount',))
+        self.assertFalse(LauncherDailyRewards.objects.exists())
+
+
+class LauncherPartialsTest(TestCase):
+
+    def setUp(self):
+        self.launcher = create_launcher('ab' * 32)
+        self.other = create_launcher('cd' * 32)
+        self.now = int(time.time())
+        self.add_partials(self.now - 6 * 3600, self.now - 2 * rollups.PARTIAL_ROLLUP_LAG, 97)
+
+    def add_partials(self, start, end, step):
+        Partial.objects.bulk_create([
+            Partial(
+                launcher=self.launcher if n % 3 else self.other,
+                timestamp=timestamp,
+                difficulty=n % 5 + 1,
+                error='TOO_LATE' if n % 7 == 0 else None,
+                harvester_id=f'harvester{n % 4}',
+            ) for n, timestamp in enumerate(range(start, end, step))
+        ])
+
+    def assert_matches_raw(self, since):
+        raw = Partial.objects.filter(launcher=self.launcher, timestamp__gte=since).aggregate(
+            successful=Count('id', filter=Q(error=None)),
+            failed=Count('id', filter=Q(error__isnull=False)),
+            points=Coalesce(Sum('difficulty'), 0),
+        )
+        harvesters = sorted(set(Partial.objects.filter(
+            launcher=self.launcher, timestamp__gte=since,
+        ).values_list('harvester_id', flat=True)))
+
+        self.assertEqual(
+            rollups.get_launcher_partials(self.launcher, since),
+            dict(raw, harvesters=harvesters),
+        )
+
+    def test_without_rollup(self):
+        self.assert_matches_raw(self.now - 4 * 3600 - 123)
+
+    def test_partly_rolled_up(self):
+        with mock.patch.object(rollups, 'PARTIAL_BATCH_SIZE', 50), \
+                mock.patch.object(rollups, 'PARTIAL_MAX_BATCHES', 2):
+            self.assertFalse(rollups.update_launcher_partial_hour())
+        self.assert_matches_raw(self.now - 4 * 3600 - 123)
+
+    def test_rolled_up_with_recent_partials(self):
+        self.assertTrue(rollups.update_launcher_partial_hour())
+        # Received within the lag, these stay in the tail
+        self.add_partials(self.now - rollups.PARTIAL_ROLLUP_LAG + 10, self.now, 7)
+        self.assertTrue(rollups.update_launcher_partial_hour())
+        self.assertEqual(
+            rollups.get_watermark_value('launcher_partial_hour'),
+            Partial.objects.filter(
+                timestamp__lt=self.now - rollups.PARTIAL_ROLLUP_LAG,
+            ).order_by('-id').values_list('id', flat=True).first(),
+        )
+        for since in (self.now - 6 * 3600, self.now - 3 * 3600 + 1, self.now - 10):
+            self.assert_matches_raw(since)
+
+
+class PayoutTransactionSummaryTest(TestCase):
+
+    def setUp(self):
+        self.a = create_launcher('ab' * 32)
+        self.b = create_launcher('cd' * 32)
+        payout = Payout.objects.create(amount=22)
+        for launcher, amount in ((self.a, 10), (self.a, 5), (self.b, 7)):
+            PayoutAddress.objects.create(payout=payout, puzzle_hash='', launcher=launcher, amount=amount)
+
+    def summary(self):
+        return set(PayoutTransactionSummary.objects.values_list(
+            'transaction_id', 'launcher_id', 'amount', 'transaction_name', 'confirmed_block_index',
+        ))
+
+    def summary_ids(self):
+        return set(PayoutTransactionSummary.objects.values_list('id', flat=True))
+
+    def test_sent_then_confirmed(self):
+        rollups.update_payout_transaction_summary()
+        self.assertEqual(self.summary(), {
+            (None, self.a.launcher_id, 15, None, None),
+            (None, self.b.launcher_id, 7, None, None),
+        })
+
+        tx = Transaction.objects.create(transaction='ef' * 32, created_at_time=timezone.now())
+        PayoutAddress.objects.update(transaction=tx)
+        rollups.update_payout_transaction_summary()
+        self.assertEqual(self.summary(), {
+            (tx.id, self.a.launcher_id, 15, tx.transaction, None),
+            (tx.id, self.b.launcher_id, 7, tx.transaction, None),
+        })
+
+        # Nothing changed, nothing is rewritten
+        ids = self.summary_ids()
+        rollups.update_payout_transaction_summary()
+        self.assertEqual(self.summary_ids(), ids)
+
+        tx.confirmed_block_index = 100
+        tx.save()
+        rollups.update_payout_transaction_summary()
+        self.assertEqual(self.summary(), {
+            (tx.id, self.a.launcher_id, 15, tx.transaction, 100),
+            (tx.id, self.b.launcher_id, 7, tx.transaction, 100),
+        })
+        self.assertFalse(ids & self.summary_ids())
+
+        # A new payout not sent yet leaves the confirmed transaction alone
+        ids = self.summary_ids()
+        PayoutAddress.objects.create(
+            payout=Payout.objects.create(amount=3), puzzle_hash='', launcher=self.a, amount=3,
+        )
+        rollups.update_payout_transaction_summary()
+        self.assertEqual(self.summary(), {
+            (tx.id, self.a.launcher_id, 15, tx.transaction, 100),
+            (tx.id, self.b.launcher_id, 7, tx.transaction, 100),
+            (None, self.a.launcher_id, 3, None, None),
+        })
+        self.assertTrue(ids < self.summary_ids())
+
+
+class KeysetPaginationTest(TestCase):
+
+    def setUp(self):
+        launchers = [create_launcher(f'{i:064x}') for i in range(3)]
+        transactions = [Transaction.objects.create(transaction=f'{i:064x}') for i in range(3)]
+        for transaction in transactions + [None]:
+            for launcher in launchers + [None]:
+                PayoutTransactionSummary.objects.create(
+                    transaction=transaction,
+                    launcher=launcher,
+                    amount=1,
+                    transaction_name=transaction and transaction.transaction,
+                )
+
+    def walk(self, url):
+        rows = []
+        while url:
+            data = self.client.get(url).json()
+            rows += data['results']
+            url = data['next']
+        return rows
+
+    def test_cursor_pages_cover_offset_pages(self):
+        offset = self.client.get('/api/v1.0/payouttransaction/?limit=100').json()['results']
+        cursor = self.walk('/api/v1.0/payouttransaction/?pagination=cursor&limit=3')
+        self.assertEqual(len(cursor), 16)
+        self.assertEqual(cursor, offset)
+        # Payouts not sent yet come first
+        self.assertEqual([i['transaction_name'] for i in cursor[:4]], [None] * 4)
+
+
+class PartialViewTest(TestCase):
+
+    def flux_table(self, result, field, error, harvester, values):
+        table = FluxTable()
+        table.columns = [FluxColumn(0, label='result', default_value=result)]
+        for end, value in values:
+            table.records.append(FluxRecord(0, {
+                '_time': datetime.datetime.fromtimestamp(end, datetime.timezone.utc),
+                '_field': field,
+                '_value': value,
+                'error': error,
+                'harvester': harvester,
+            }))
+        return table
+
+    def test_merges_sum_and_count(self):
+        hour = int(time.time()) // 3600 * 3600 - 3600
+        tables = [
+            self.flux_table('sum', 'difficulty', 'false', 'h1', [(hour, None), (hour + 3600, 30)]),
+            self.flux_table('sum', 'difficulty', 'true', 'h1', [(hour, None), (hour + 3600, 5)]),
+            self.flux_table('count', 'difficulty', 'false', 'h1', [(hour, 0), (hour + 3600, 3)]),
+            self.flux_table('count', 'difficulty', 'true', 'h1', [(hour, 0), (hour + 3600, 1)]),
+            self.flux_table('count', 'time_taken', 'false', 'h1', [(hour, 0), (hour + 3600, 3)]),
+        ]
+        with mock.patch('api.views.get_influxdb_client') as client:
+            client.return_value.query_api.return_value.query.return_value = tables
+            data = self.client.get(f'/api/v1.0/stats/partial/?launcher={"ab" * 32}&days=1').json()
+
+        self.assertEqual(len(data), 25)
+        self.assertEqual(
+            [i for i in data if i['harvester']],
+            [{
+                'datetime': datetime.datetime.fromtimestamp(hour, datetime.timezone.utc).isoformat().replace(
+                    '+00:00', 'Z',
+                ),
+                'harvester': 'h1',
+                'points': 35,
+                'successful': 3,
+                'failed': 1,
+            }],
+        )
+
+
+class LauncherSearchViewTest(TestCase):
+
+    def test_invalid_limit(self):
+        response = self.client.get('/api/v1.0/launcher_search/?q=abc&limit=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('limit', response.json())
+
+
+class PartialArchiveTest(TransactionTestCase):
+
+    def setUp(self):
+        self.launcher = create_launcher('ab' * 32)
+        self.day = int(time.time()) // archive.DAY * archive.DAY - 2 * archive.DAY
+        self.add_partials(self.day, self.day + archive.DAY, 3600)
+        self.archive_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.archive_dir.cleanup)
+        self.settings = override_settings(PARTIAL_ARCHIVE_DIR=self.archive_dir.name)
+        self.settings.enable()
+        self.addCleanup(self.settings.disable)
+
+    def add_partials(self, start, end, step, launcher=None):
+        Partial.objects.bulk_create([
+            Partial(launcher=launcher or self.launcher, timestamp=timestamp, difficulty=1, harvester_id='harvester')
+            for timestamp in range(start, end, step)
+        ])
+
+    def archived(self, launcher=None):
+        launcher = launcher or self.launcher
+        return [row[2] for row in archive.archived_rows(launcher.launcher_id, 0, int(time.time()))]
+
+    def test_late_partials_are_archived_before_retention(self):
+        call_command('partial_archive')
+        self.assertEqual(archive.get_archived_days(), [self.day, self.day + archive.DAY])
+        # Committed after its day was archived, by a launcher sorting first
+        other = create_launcher('01' * 32)
+        self.add_partials(self.day + 1800, self.day + 1801, 1)
+        self.add_partials(self.day + 60, self.day + 61, 1, launcher=other)
+
+        with mock.patch('api.management.commands.partial_retention.archive_late_days', return_value=[]):
+            call_command('partial_retention', days=0)
+        self.assertEqual(Partial.objects.count(), 2)
+        self.assertEqual(len(self.archived()), 24)
+
+        call_command('partial_retention', days=0)
+        self.assertFalse(Partial.objects.exists())
+        self.assertEqual(self.archived(), sorted([*range(self.day, self.day + archive.DAY, 3600), self.day + 1800]))
+        self.assertEqual(self.archived(other), [self.day + 60])
@@ -2,19 +2,26 @@ from django.urls import include, path, re_path
 from rest_framework import routers
 from .views import (
     BlockViewSet,
+    EffortView,
+    HarvesterView,
+    LauncherSearchView,
     LauncherSizeView,
     LauncherViewSet,
+    LeaderboardViewSet,
     LoginView,
     LoginQRView,
     LoggedInView,
     MempoolView,
     NetspaceView,
+    PartialDimensionView,
+    PartialExportView,
     PartialView,  # timeseries
     PartialViewSet,
     PayoutAddressViewSet,
     PayoutTransactionViewSet,
     PayoutViewSet,
     PoolSizeView,
+    ProfitabilityView,
     QRCodeView,
     StatsView,
     TransactionViewSet,
@@ -27,6 +34,7 @@ from referral.views import ReferralViewSet
 router = routers.DefaultRouter()
 router.register('block', BlockViewSet)
 router.register('launcher', LauncherViewSet)
+router.register('leaderboard', LeaderboardViewSet)
 router.register('partial', PartialViewSet)
 router.register('payout', PayoutViewSet)
 router.register('payoutaddress', PayoutAddressViewSet)
@@ -40,15 +48,21 @@ app_name = 'api'
 urlpatterns = [
     path('', include(router.urls)),
     path('giveaway/closest', ClosestTicketView.as_view()),
+    re_path(r'launcher_search/?', LauncherSearchView.as_view()),
     re_path(r'launcher_size/?', LauncherSizeView.as_view()),
     re_path(r'pool_size/?', PoolSizeView.as_view()),
+    re_path(r'stats/effort/?', EffortView.as_view()),
+    re_path(r'stats/harvester/?', HarvesterView.as_view()),
     re_path(r'stats/mempool/?', MempoolView.as_view()),
     re_path(r'stats/netspace/?', NetspaceView.as_view()),
+    re_path(r'stats/partial_dimension/?', PartialDimensionView.as_view()),
     re_path(r'stats/partial/?', PartialView.as_view()),
+    re_path(r'stats/profitability/?', ProfitabilityView.as_view()),
     re_path(r'stats/xchprice/?', XCHPriceView.as_view()),
     path('login', LoginView.as_view()),
     path('login_qr', LoginQRView.as_view()),
     re_path(r'payouttransaction/?', PayoutTransactionViewSet.as_view()),
+    re_path(r'partial_export/?', PartialExportView.as_view()),
     path('qrcode', QRCodeView.as_view()),
     path('loggedin', LoggedInView.as_view()),
     path('stats', StatsView.as_view()),
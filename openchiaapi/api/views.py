@@ -5,6 +5,7 @@ import os
 import time
 import qrcode
 import qrcode.image.svg
+import re
 import textwrap
 
 from chia_rs import AugSchemeMPL, G1Element, G2Element
@@ -14,62 +15,126 @@ from chia.util.bech32m import decode_puzzle_hash
 from chia.util.byte_types import hexstr_to_bytes
 from chia.util.hash import std_hash
 from chia.util.ints import uint64
-from datetime import datetime
-from decimal import Decimal
+from datetime import datetime, timezone
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.exceptions import ObjectDoesNotExist
-from django.db.models import Avg, F, Sum, Q
+from django.db.models import F, Q
+from django.http import StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import rest_framework as django_filters
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import filters, mixins, serializers, viewsets
 from rest_framework.exceptions import NotAuthenticated, NotFound
-from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.pagination import CursorPagination
 from rest_framework.views import APIView
 from rest_framework.renderers import BaseRenderer
 from rest_framework.response import Response
 
 from .models import (
-    Block, GlobalInfo, Launcher, Partial, Payout, PayoutAddress,
+    Block, BlockEffortStats, Launcher, LauncherEffort, Leaderboard, Partial, Payout, PayoutAddress,
+    PayoutTransactionSummary,
     Notification,
     Transaction,
 )
 from .serializers import (
+    BlockExpandedSerializer,
     BlockSerializer,
+    EffortSerializer,
+    HarvesterSerializer,
+    LauncherMinimalSerializer,
     LauncherSerializer,
     LauncherUpdateSerializer,
+    LeaderboardSerializer,
     LoginSerializer,
     LoginQRSerializer,
+    PartialDimensionSerializer,
     PartialSerializer,
+    PartialTimeseriesSerializer,
     PayoutSerializer,
+    PayoutAddressFlatSerializer,
     PayoutAddressSerializer,
     PayoutTransactionSerializer,
+    ProfitabilitySerializer,
     StatsSerializer,
     TimeseriesSerializer,
     TransactionSerializer,
     XCHScanStatsSerializer,
 )
+from .cache import stale_while_revalidate
+from .conditional import (
+    block_launcher_version,
+    block_version,
+    conditional_get,
+    launcher_name_version,
+    launcher_version,
+    leaderboard_version,
+    payout_transaction_version,
+    payout_version,
+    stats_last_modified,
+    transaction_version,
+)
+from .export import EXPORT_FORMATS, partial_rows
+from .pagination import HybridPagination
+from .rollups import (
+    PARTIAL_DIMENSIONS,
+    get_launcher_harvesters,
+    get_launcher_partial_hours,
+    get_partial_dimension,
+    get_profitability_history,
+)
+from .stats import get_pool_stats
 from .utils import (
     days_to_every,
     get_influxdb_client,
-    get_pool_info,
     get_pool_target_address,
-    estimated_time_to_win,
 )
 from referral.utils import update_referral
 
 
 logger = logging.getLogger('api.views')
 POOL_TARGET_ADDRESS = get_pool_target_address()
+HEX_RE = re.compile(r'^(0x)?[0-9a-f]+$')
 
 
+@conditional_get(block_version, payout_version, block_launcher_version)
 class BlockViewSet(viewsets.ReadOnlyModelViewSet):
-    queryset = Block.objects.all()
+    queryset = Block.objects.select_related('farmed_by')
     serializer_class = BlockSerializer
+    pagination_class = HybridPagination
     filterset_fields = ['farmed_by', 'payout']
     ordering_fields = ['confirmed_block_index', 'farmed_height', 'payout']
     ordering = ['-farmed_height']
 
+    expand_param = openapi.Parameter(
+        'expand',
+        openapi.IN_QUERY,
+        description='Use "farmed_by" to embed the full launcher',
+        type=openapi.TYPE_STRING,
+    )
+
+    def expand_launcher(self):
+        return 'farmed_by' in self.request.query_params.get('expand', '').split(',')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.expand_launcher():
+            queryset = LauncherSerializer.setup_eager_loading(queryset, 'farmed_by__')
+        return queryset
+
+    def get_serializer_class(self):
+        if self.expand_launcher():
+            return BlockExpandedSerializer
+        return BlockSerializer
+
+    @swagger_auto_schema(manual_parameters=[expand_param])
+    def list(self, *args, **kwargs):
+        return super().list(*args, **kwargs)
+
+    @swagger_auto_schema(manual_parameters=[expand_param])
+    def retrieve(self, *args, **kwargs):
+        return super().retrieve(*args, **kwargs)
+
 
 class LauncherFilter(django_filters.FilterSet):
     points__gt = django_filters.NumberFilter(field_name='points', lookup_expr='gt')
@@ -84,6 +149,7 @@ class LauncherFilter(django_filters.FilterSet):
         ]
 
 
+@conditional_get(launcher_version, block_version, payout_version, methods=('retrieve',))
 class LauncherViewSet(
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -98,11 +164,42 @@ class LauncherViewSet(
     ordering_fields = ['points', 'points_pplns', 'difficulty']
     ordering = ['-points']
 
+    fields_param = openapi.Parameter(
+        'fields',
+        openapi.IN_QUERY,
+        description='Comma separated fields to include',
+        type=openapi.TYPE_STRING,
+    )
+    omit_param = openapi.Parameter(
+        'omit',
+        openapi.IN_QUERY,
+        description='Comma separated fields to leave out',
+        type=openapi.TYPE_STRING,
+    )
+
+    def get_queryset(self):
+        return LauncherSerializer.setup_eager_loading(super().get_queryset())
+
     def get_serializer_class(self, *args, **kwargs):
         if self.request.method == 'PUT':
             return LauncherUpdateSerializer
         return LauncherSerializer
 
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            for i in ('fields', 'omit'):
+                if self.request.query_params.get(i):
+                    kwargs[i] = [j.strip() for j in self.request.query_params[i].split(',')]
+        return super().get_serializer(*args, **kwargs)
+
+    @swagger_auto_schema(manual_parameters=[fields_param, omit_param])
+    def list(self, *args, **kwargs):
+        return super().list(*args, **kwargs)
+
+    @swagger_auto_schema(manual_parameters=[fields_param, omit_param])
+    def retrieve(self, *args, **kwargs):
+        return super().retrieve(*args, **kwargs)
+
     def update(self, request, pk):
         launcher_id = request.session.get('launcher_id')
         if not launcher_id and request.auth:
@@ -152,131 +249,72 @@ class LauncherViewSet(
         return Response(s.validated_data)
 
 
+@conditional_get(stats_last_modified, last_modified=stats_last_modified)
 class StatsView(APIView):
 
     @swagger_auto_schema(responses={200: StatsSerializer(many=False)})
     def get(self, request, format=None):
-        block = Block.objects.order_by('-confirmed_block_index')
-        farmers = Launcher.objects.filter(is_pool_member=True)
-        farmers_total = farmers.count()
-        farmers_active = farmers.filter(points_pplns__gt=0).count()
-        pool_info = get_pool_info()
-
-        client = get_influxdb_client()
-        query_api = client.query_api()
+        return Response(stale_while_revalidate('stats', self.get_stats))
 
-        try:
-            q = query_api.query(
-                textwrap.dedent('''from(bucket: "openchia")
-                  |> range(start: duration(v: "-60m"))
-                  |> filter(fn: (r) => r["_measurement"] == "pool_size")
-                  |> filter(fn: (r) => r["_field"] == "global")
-                  |> last()'''),
-            )
-            size = int(q[0].records[0]['_value'])
-        except Exception:
-            logger.error('Failed to get pool size', exc_info=True)
-            size = 0
-
-        globalinfo = GlobalInfo.load()
-        minutes_to_win = estimated_time_to_win(
-            size, int(globalinfo.blockchain_space), globalinfo.blockchain_avg_block_time,
-        )
-        if block.exists():
-            time_since_last_win = int(time.time() - block[0].timestamp)
+    def get_stats(self):
+        snapshot = get_pool_stats()
+        if snapshot.last_rewards:
+            time_since_last_win = int(time.time() - snapshot.last_rewards[0]['timestamp'])
         else:
             time_since_last_win = None
 
-        profitability = 0
-        days30 = 30 * 24 * 60 * 60
-        for b in block.filter(timestamp__gte=time.time() - days30):
-            if b.pool_space > 0:
-                profitability += (b.amount / 1000000000000) / (b.pool_space / 1099511627776)
-        profitability /= 30
-
-        try:
-            q = query_api.query(
-                textwrap.dedent('''from(bucket: "openchia")
-                  |> range(start: duration(v: "-60m"))
-                  |> filter(fn: (r) => r["_measurement"] == "mempool")
-                  |> filter(fn: (r) => r["_field"] == "full_pct")
-                  |> last()'''),
-            )
-            mempool_full_pct = int(q[0].records[0]['_value'])
-            blockchain_duststorm = mempool_full_pct > 90
-        except Exception:
-            logger.error('Failed to get mempool', exc_info=True)
-            mempool_full_pct = 0
-            blockchain_duststorm = False
-
         pi = StatsSerializer(data={
-            'fee': Decimal(pool_info['fee']),
-            'farmers': farmers_total,
-            'farmers_active': farmers_active,
-            'rewards_amount': block.aggregate(total=Sum('amount'))['total'],
-            'rewards_blocks': block.count(),
-            'pool_space': size,
-            'estimate_win': minutes_to_win,
+            'fee': snapshot.fee,
+            'farmers': snapshot.farmers,
+            'farmers_active': snapshot.farmers_active,
+            'rewards_amount': snapshot.rewards_amount,
+            'rewards_blocks': snapshot.rewards_blocks,
+            'pool_space': snapshot.pool_space,
+            'estimate_win': snapshot.estimate_win,
             'time_since_last_win': time_since_last_win,
-            'blockchain_height': globalinfo.blockchain_height,
-            'blockchain_space': int(globalinfo.blockchain_space),
-            'blockchain_duststorm': blockchain_duststorm,
-            'blockchain_mempool_full_pct': mempool_full_pct,
+            'blockchain_height': snapshot.blockchain_height,
+            'blockchain_space': int(snapshot.blockchain_space),
+            'blockchain_duststorm': snapshot.blockchain_mempool_full_pct > 90,
+            'blockchain_mempool_full_pct': snapshot.blockchain_mempool_full_pct,
             'reward_system': 'PPLNS',
             'last_rewards': [{
-                'date': datetime.utcfromtimestamp(i.timestamp),
-                'height': i.confirmed_block_index,
-            } for i in block[:10]],
-            'xch_current_price': globalinfo.xch_current_price,
-            'pool_wallets': globalinfo.wallets,
-            'average_effort': block.filter(
-                ~Q(luck=-1), timestamp__gte=time.time() - days30
-            ).aggregate(total=Avg('luck'))['total'],
-            'xch_tb_month': profitability,
+                'date': datetime.utcfromtimestamp(i['timestamp']),
+                'height': i['height'],
+            } for i in snapshot.last_rewards],
+            'xch_current_price': snapshot.xch_current_price,
+            'pool_wallets': snapshot.pool_wallets,
+            'average_effort': snapshot.average_effort,
+            'xch_tb_month': snapshot.xch_tb_month,
         })
         pi.is_valid()
-        return Response(pi.data)
+        return pi.data
 
 
+@conditional_get(stats_last_modified, last_modified=stats_last_modified)
 class XCHScanStatsView(APIView):
 
     @swagger_auto_schema(responses={200: XCHScanStatsSerializer(many=False)})
     def get(self, request, format=None):
-        block = Block.objects.order_by('-confirmed_block_index')
-        farmers = Launcher.objects.filter(is_pool_member=True).count()
-        pool_info = get_pool_info()
+        return Response(stale_while_revalidate('xchscan_stats', self.get_stats))
 
-        client = get_influxdb_client()
-        query_api = client.query_api()
-
-        try:
-            q = query_api.query(
-                textwrap.dedent('''from(bucket: "openchia")
-                  |> range(start: duration(v: "-60m"))
-                  |> filter(fn: (r) => r["_measurement"] == "pool_size")
-                  |> filter(fn: (r) => r["_field"] == "global")
-                  |> last()'''),
-            )
-            size = int(q[0].records[0]['_value'])
-        except Exception:
-            logger.error('Failed to get pool size', exc_info=True)
-            size = 0
+    def get_stats(self):
+        snapshot = get_pool_stats()
 
         pi = XCHScanStatsSerializer(data={
             'poolInfo': {
                 'puzzle_hash': '0x' + decode_puzzle_hash(POOL_TARGET_ADDRESS).hex(),
-                'fee': Decimal(pool_info['fee']) * 100,
+                'fee': snapshot.fee * 100,
                 'minPay': 0,
             },
-            'farmers': farmers,
-            'capacityBytes': size,
+            'farmers': snapshot.farmers,
+            'capacityBytes': snapshot.pool_space,
             'farmedBlocks': [{
-                'time': i.timestamp,
-                'height': i.confirmed_block_index,
-            } for i in block[:10]],
+                'time': i['timestamp'],
+                'height': i['height'],
+            } for i in snapshot.last_rewards],
         })
         pi.is_valid()
-        return Response(pi.data)
+        return pi.data
 
 
 class PartialFilter(django_filters.FilterSet):
@@ -417,12 +455,84 @@ class LoggedInView(APIView):
 class PartialViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Partial.objects.all()
     serializer_class = PartialSerializer
+    pagination_class = HybridPagination
     filterset_fields = ['launcher', 'timestamp', 'min_timestamp']
     filterset_class = PartialFilter
     ordering_fields = ['timestamp']
     ordering = ['-timestamp']
+    cursor_ordering = ['-timestamp', '-id']
+
+
+class PartialExportView(APIView):
+    """
+    Stream all the partials of a launcher, as NDJSON or CSV.
+    """
+
+    launcher = openapi.Parameter(
+        'launcher',
+        openapi.IN_QUERY,
+        description='Launcher ID',
+        type=openapi.TYPE_STRING,
+        required=True,
+    )
+    start_param = openapi.Parameter(
+        'start',
+        openapi.IN_QUERY,
+        description='Start timestamp (default: 0)',
+        type=openapi.TYPE_INTEGER,
+    )
+    end_param = openapi.Parameter(
+        'end',
+        openapi.IN_QUERY,
+        description='End timestamp, exclusive (default: now)',
+        type=openapi.TYPE_INTEGER,
+    )
+    output_param = openapi.Parameter(
+        'output',
+        openapi.IN_QUERY,
+        description='ndjson (default) or csv',
+        type=openapi.TYPE_STRING,
+    )
+
+    @swagger_auto_schema(manual_parameters=[launcher, start_param, end_param, output_param])
+    def get(self, request, format=None):
+        launcher = self.request.query_params.get('launcher')
+        if not launcher:
+            raise serializers.ValidationError({'launcher': 'This field is required.'})
+        output = self.request.query_params.get('output', 'ndjson')
+        if output not in EXPORT_FORMATS:
+            raise serializers.ValidationError({'output': f'Must be one of {", ".join(EXPORT_FORMATS)}.'})
+        try:
+            start = int(self.request.query_params.get('start', 0))
+            end = int(self.request.query_params.get('end', time.time() + 1))
+        except ValueError:
+            raise serializers.ValidationError('start and end must be timestamps.')
+
+        content_type, lines = EXPORT_FORMATS[output]
+        response = StreamingHttpResponse(
+            lines(partial_rows(launcher, start, end)), content_type=content_type,
+        )
+        response['Content-Disposition'] = f'attachment; filename="partials-{launcher}.{output}"'
+        return response
+
+
+class LeaderboardPagination(CursorPagination):
+    ordering = 'rank'
 
 
+@conditional_get(leaderboard_version)
+class LeaderboardViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Pool members ranked by PPLNS points, rebuilt every minute.
+    Retrieve by launcher id to get the rank of a single farmer.
+    """
+    queryset = Leaderboard.objects.all()
+    serializer_class = LeaderboardSerializer
+    pagination_class = LeaderboardPagination
+    filter_backends = []
+
+
+@conditional_get(payout_version)
 class PayoutViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Payout.objects.all()
     serializer_class = PayoutSerializer
@@ -430,20 +540,85 @@ class PayoutViewSet(viewsets.ReadOnlyModelViewSet):
     ordering = ['-datetime']
 
 
+@conditional_get(transaction_version)
 class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
 
 
+@conditional_get(payout_version, transaction_version, launcher_name_version)
 class PayoutAddressViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = PayoutAddress.objects.all()
     serializer_class = PayoutAddressSerializer
+    pagination_class = HybridPagination
     filterset_fields = ['payout', 'puzzle_hash', 'launcher']
     ordering_fields = ['payout', 'launcher', 'confirmed_block_index', 'amount']
     ordering = ['-payout', '-amount']
+    cursor_ordering = ['-payout', '-amount', '-id']
+
+    flat_param = openapi.Parameter(
+        'flat',
+        openapi.IN_QUERY,
+        description='Return the payout, launcher and transaction ids of each row with the '
+                    'referenced objects side loaded once in "payouts", "launchers" and "transactions"',
+        type=openapi.TYPE_BOOLEAN,
+    )
+
+    def flat(self):
+        return self.request.query_params.get('flat') in ('1', 'true')
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.flat():
+            return queryset
+        return queryset.select_related('launcher', 'payout', 'transaction').prefetch_related('payout__blocks')
+
+    def get_serializer_class(self):
+        if self.flat():
+            return PayoutAddressFlatSerializer
+        return PayoutAddressSerializer
+
+    def side_load(self, rows):
+        context = self.get_serializer_context()
+        payouts = list(Payout.objects.filter(
+            id__in={i.payout_id for i in rows},
+        ).prefetch_related('blocks').order_by('id'))
+        launchers = list(Launcher.objects.filter(
+            launcher_id__in={i.launcher_id for i in rows if i.launcher_id},
+        ).only('launcher_id', 'name').order_by('launcher_id'))
+        transactions = list(Transaction.objects.filter(
+            id__in={i.transaction_id for i in rows if i.transaction_id},
+        ).order_by('id'))
+        return {
+            'payouts': dict(zip(
+                (i.id for i in payouts),
+                PayoutSerializer(payouts, many=True, context=context).data,
+            )),
+            'launchers': dict(zip(
+                (i.launcher_id for i in launchers),
+                LauncherMinimalSerializer(launchers, many=True, context=context).data,
+            )),
+            'transactions': dict(zip(
+                (i.id for i in transactions),
+                TransactionSerializer(transactions, many=True, context=context).data,
+            )),
+        }
+
+    @swagger_auto_schema(manual_parameters=[flat_param])
+    def list(self, request, *args, **kwargs):
+        if not self.flat():
+            return super().list(request, *args, **kwargs)
+        rows = list(self.paginate_queryset(self.filter_queryset(self.get_queryset())))
+        response = self.get_paginated_response(self.get_serializer(rows, many=True).data)
+        response.data.update(self.side_load(rows))
+        return response
 
 
+@conditional_get(payout_transaction_version)
 class PayoutTransactionViewSet(APIView):
+    # Unique in the summary, the payouts not sent yet (NULL transaction) first
+    cursor_ordering = ['-transaction', 'launcher']
+
     launcher = openapi.Parameter(
         'launcher',
         openapi.IN_QUERY,
@@ -455,24 +630,67 @@ class PayoutTransactionViewSet(APIView):
         responses={200: PayoutTransactionSerializer(many=True)}
     )
     def get(self, request, format=None):
-        paginator = LimitOffsetPagination()
+        paginator = HybridPagination()
         launcher = request.GET.get('launcher')
-        payouts = PayoutAddress.objects.values(
+        payouts = PayoutTransactionSummary.objects.values(
             'launcher',
-            confirmed_block_index=F('transaction__confirmed_block_index'),
-            created_at_time=F('transaction__created_at_time'),
-            transaction_name=F('transaction__transaction'),
-            xch_price=F('transaction__xch_price'),
-        ).order_by('-transaction', 'launcher').annotate(amount=Sum('amount'))
+            'transaction',
+            'amount',
+            'confirmed_block_index',
+            'created_at_time',
+            'transaction_name',
+            'xch_price',
+        ).order_by('-transaction', 'launcher')
         if launcher:
             payouts = payouts.filter(launcher=launcher)
-        result_page = paginator.paginate_queryset(payouts, request)
+        result_page = paginator.paginate_queryset(payouts, request, self)
         serializer = PayoutTransactionSerializer(result_page, many=True, context={
             'request': request,
         })
         return paginator.get_paginated_response(serializer.data)
 
 
+class LauncherSearchView(APIView):
+
+    q_param = openapi.Parameter(
+        'q',
+        openapi.IN_QUERY,
+        description='Name or launcher id prefix',
+        type=openapi.TYPE_STRING,
+    )
+    limit_param = openapi.Parameter(
+        'limit',
+        openapi.IN_QUERY,
+        description='Number of results (default: 10, max: 50)',
+        type=openapi.TYPE_INTEGER,
+    )
+
+    @swagger_auto_schema(
+        manual_parameters=[q_param, limit_param],
+        responses={200: LauncherMinimalSerializer(many=True)},
+    )
+    def get(self, request, format=None):
+        q = self.request.query_params.get('q', '').strip()
+        try:
+            limit = min(max(int(self.request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            raise serializers.ValidationError({'limit': 'A valid integer is required.'})
+        if not q:
+            return Response([])
+
+        # Name matches use the trigram index, launcher id prefixes the
+        # varchar_pattern_ops one.
+        lookup = Q(name__icontains=q)
+        launcher_id = q.lower()
+        if HEX_RE.match(launcher_id):
+            lookup |= Q(launcher_id__startswith=launcher_id.removeprefix('0x'))
+
+        launchers = Launcher.objects.filter(lookup).only('launcher_id', 'name').annotate(
+            similarity=TrigramSimilarity('name', q),
+        ).order_by(F('similarity').desc(nulls_last=True), '-points_pplns')[:limit]
+        return Response(LauncherMinimalSerializer(launchers, many=True).data)
+
+
 class LauncherSizeView(APIView):
 
     days_param = openapi.Parameter(
@@ -670,23 +888,48 @@ class PartialView(APIView):
     days_param = openapi.Parameter(
         'days',
         openapi.IN_QUERY,
-        description='Number of days (default: 7)',
+        description='Number of days (default: 7, max: 90), over 7 days without harvesters',
         type=openapi.TYPE_INTEGER,
     )
 
     @swagger_auto_schema(
         manual_parameters=[days_param, launcher],
-        responses={200: TimeseriesSerializer(many=True)},
+        responses={200: PartialTimeseriesSerializer(many=True)},
     )
     def get(self, request, format=None):
-        client = get_influxdb_client()
-        query_api = client.query_api()
-
-        days = int(self.request.query_params.get('days', 7))
+        days = min(max(int(self.request.query_params.get('days', 7)), 1), 90)
         launcher = self.request.query_params['launcher']
+        now = int(time.time())
+        since = now - days * 24 * 3600
+
+        # InfluxDB only keeps the last week, use the hourly counters beyond
+        if days > 7:
+            hours = get_launcher_partial_hours(launcher, since)
+            result = [{
+                'datetime': datetime.fromtimestamp(hour, timezone.utc),
+                'harvester': None,
+                **counters,
+            } for hour, counters in hours.items()]
+        else:
+            hours, result = self.get_influxdb_hours(launcher, days)
+
+        # Hours without any partial
+        for hour in range(since // 3600 * 3600, now, 3600):
+            if hour not in hours:
+                result.append({
+                    'datetime': datetime.fromtimestamp(hour, timezone.utc),
+                    'harvester': None,
+                    'points': 0,
+                    'successful': 0,
+                    'failed': 0,
+                })
+
+        result.sort(key=lambda i: i['datetime'])
+        return Response(PartialTimeseriesSerializer(result, many=True).data)
 
-        if days >= 7:
-            days = 7
+    def get_influxdb_hours(self, launcher, days):
+        client = get_influxdb_client()
+        query_api = client.query_api()
 
         params = {
             '_days': f"-{days}d",
@@ -714,27 +957,155 @@ class PartialView(APIView):
               '''
             ), params=params)
 
-        result = []
-        num = 0
+        # Merge the sum and count series of both error values into one item
+        # per harvester and hour. Windows are timed by their (exclusive) end.
+        items = {}
         for table in q:
             default = table.columns[0].default_value
             for r in table.records:
-                # 24 per day -- 7 days -- 2 per hour -- 2 sum/count -- breath room
-                if num > 24 * 7 * 2 * 2 * 2:
-                    break
-                item = {
-                    'result': default,
-                    'datetime': r['_time'],
-                    'field': r['_field'],
-                    'value': r['_value'],
-                    'launcher': r['launcher'],
+                if r['_field'] != 'difficulty' or r['_value'] is None:
+                    continue
+                hour = (int(r['_time'].timestamp()) - 1) // 3600 * 3600
+                item = items.setdefault((hour, r['harvester']), {
+                    'datetime': datetime.fromtimestamp(hour, timezone.utc),
                     'harvester': r['harvester'],
-                    'error': r.values.get('error'),
-                }
-                result.append(item)
-                num += 1
+                    'points': 0,
+                    'successful': 0,
+                    'failed': 0,
+                })
+                if default == 'sum':
+                    item['points'] += int(r['_value'])
+                elif r.values.get('error') == 'true':
+                    item['failed'] += r['_value']
+                else:
+                    item['successful'] += r['_value']
 
-        return Response(result)
+        # Empty windows are counted as 0, they are filled in as hours without partials
+        result = [i for i in items.values() if i['successful'] or i['failed']]
+        hours = {int(i['datetime'].timestamp()) for i in result}
+        return hours, result
+
+
+class HarvesterView(APIView):
+    """
+    Partials per harvester of a launcher.
+    """
+
+    launcher = openapi.Parameter(
+        'launcher',
+        openapi.IN_QUERY,
+        description='Launcher ID',
+        type=openapi.TYPE_STRING,
+        required=True,
+    )
+    days_param = openapi.Parameter(
+        'days',
+        openapi.IN_QUERY,
+        description='Number of days, counting today (default: 1)',
+        type=openapi.TYPE_INTEGER,
+    )
+
+    @swagger_auto_schema(
+        manual_parameters=[launcher, days_param],
+        responses={200: HarvesterSerializer(many=True)},
+    )
+    def get(self, request, format=None):
+        launcher = self.request.query_params.get('launcher')
+        if not launcher:
+            raise serializers.ValidationError({'launcher': 'This field is required.'})
+        days = min(max(int(self.request.query_params.get('days', 1)), 1), 90)
+        since = int(time.time()) - (days - 1) * 24 * 60 * 60
+        harvesters = get_launcher_harvesters(launcher, since)
+        return Response(HarvesterSerializer(harvesters, many=True).data)
+
+
+class PartialDimensionView(APIView):
+    """
+    Partials per error, chia_version or pool_host value, pool wide or for a
+    launcher. Values are empty for partials without it (no error).
+    """
+
+    dimension_param = openapi.Parameter(
+        'dimension',
+        openapi.IN_QUERY,
+        description=', '.join(PARTIAL_DIMENSIONS),
+        type=openapi.TYPE_STRING,
+        required=True,
+    )
+    launcher = openapi.Parameter(
+        'launcher',
+        openapi.IN_QUERY,
+        description='Launcher ID, by whole days including today',
+        type=openapi.TYPE_STRING,
+    )
+    days_param = openapi.Parameter(
+        'days',
+        openapi.IN_QUERY,
+        description='Number of days (default: 1)',
+        type=openapi.TYPE_INTEGER,
+    )
+
+    @swagger_auto_schema(
+        manual_parameters=[dimension_param, launcher, days_param],
+        responses={200: PartialDimensionSerializer(many=True)},
+    )
+    def get(self, request, format=None):
+        dimension = self.request.query_params.get('dimension')
+        if dimension not in PARTIAL_DIMENSIONS:
+            raise serializers.ValidationError({'dimension': f'Must be one of {", ".join(PARTIAL_DIMENSIONS)}.'})
+        launcher = self.request.query_params.get('launcher')
+        days = min(max(int(self.request.query_params.get('days', 1)), 1), 90)
+        if launcher:
+            since = int(time.time()) - (days - 1) * 24 * 60 * 60
+        else:
+            since = int(time.time()) - days * 24 * 60 * 60
+        values = get_partial_dimension(dimension, since, launcher=launcher or None)
+        return Response(PartialDimensionSerializer(values, many=True).data)
+
+
+class ProfitabilityView(APIView):
+
+    days_param = openapi.Parameter(
+        'days',
+        openapi.IN_QUERY,
+        description='Number of days (default: 30)',
+        type=openapi.TYPE_INTEGER,
+    )
+
+    @swagger_auto_schema(
+        manual_parameters=[days_param],
+        responses={200: ProfitabilitySerializer(many=True)},
+    )
+    def get(self, request, format=None):
+        days = min(max(int(self.request.query_params.get('days', 30)), 1), 365 * 5)
+        serializer = ProfitabilitySerializer(get_profitability_history(days), many=True)
+        return Response(serializer.data)
+
+
+class EffortView(APIView):
+
+    launcher = openapi.Parameter(
+        'launcher',
+        openapi.IN_QUERY,
+        description='Launcher ID',
+        type=openapi.TYPE_STRING,
+    )
+
+    @swagger_auto_schema(
+        manual_parameters=[launcher],
+        responses={200: EffortSerializer(many=False)},
+    )
+    def get(self, request, format=None):
+        stats = BlockEffortStats.load()
+        data = {
+            'updated_at': stats.updated_at,
+            'bins': stats.bins,
+            'windows': stats.windows,
+        }
+        launcher = self.request.query_params.get('launcher')
+        if launcher:
+            data['launcher'] = LauncherEffort.objects.filter(launcher=launcher).first()
+        return Response(EffortSerializer(data).data)
 
 
 class MempoolView(APIView):
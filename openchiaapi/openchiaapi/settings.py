@@ -121,6 +121,42 @@ else:
     }
 
 
+# Shared across workers when pointed to a redis/memcached/database backend,
+# which production should use, e.g. in the settings file (the table is
+# created by createcachetable):
+#   cache:
+#     backend: django.core.cache.backends.db.DatabaseCache
+#     location: api_cache
+# LocMemCache is per process, every worker computes its own stats.
+if 'cache' in django_settings:
+    CACHES = {
+        'default': {
+            'BACKEND': django_settings['cache']['backend'],
+            'LOCATION': django_settings['cache'].get('location', ''),
+            'OPTIONS': django_settings['cache'].get('options', {}),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Seconds a cached stats response is fresh, and how long past that it can
+# still be served while a single worker recomputes it.
+STATS_CACHE_TTL = django_settings.get('stats_cache', {}).get('ttl', 10)
+STATS_CACHE_STALE_TTL = django_settings.get('stats_cache', {}).get('stale_ttl', 300)
+# Seconds the stats refresh waits on InfluxDB and the database before
+# keeping the last known values.
+STATS_DEADLINE = django_settings.get('stats_deadline', 5)
+
+# Days of raw partials to keep, older ones only remain in the rollups
+PARTIAL_RETENTION_DAYS = django_settings.get('partial_retention_days')
+# Directory of the partial_archive files, retention keeps unarchived days
+PARTIAL_ARCHIVE_DIR = django_settings.get('partial_archive_dir')
+
+
 if 'influxdb' in django_settings:
     INFLUXDB_URL = django_settings['influxdb']['url']
     INFLUXDB_TOKEN = django_settings['influxdb']['token']
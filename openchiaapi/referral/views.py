@@ -2,6 +2,7 @@ from rest_framework import viewsets
 
 from .models import Referral
 from .serializers import ReferralSerializer
+from api.serializers import LauncherSerializer
 
 
 class ReferralViewSet(viewsets.ReadOnlyModelViewSet):
@@ -11,3 +12,7 @@ class ReferralViewSet(viewsets.ReadOnlyModelViewSet):
     search_fields = ['launcher', 'referrer']
     ordering_fields = ['total_income']
     ordering = ['-total_income']
+
+    def get_queryset(self):
+        queryset = LauncherSerializer.setup_eager_loading(super().get_queryset(), 'launcher__')
+        return LauncherSerializer.setup_eager_loading(queryset, 'referrer__')